@@ -0,0 +1,107 @@
+"""Benchmarks of the complexity metrics."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+from mecons.complexity import (
+    lempel_ziv_complexity,
+    amplitude_coalition_entropy,
+    synchrony_coalition_entropy,
+    compute_metrics,
+    compute_multiscale_metrics,
+    compute_entropy
+)
+from mecons.utils import binarize_hilbert_amplitude, map_matrix_to_integer
+
+from .common import N_CHANNELS, N_TIMES, N_EPOCHS, make_eeg, skip_if_too_large
+
+
+class _MetricSuite:
+    """Data of shape (n_epochs, n_channels, n_times) for each metric."""
+
+    params = (N_CHANNELS, N_TIMES, N_EPOCHS)
+    param_names = ["n_channels", "n_times", "n_epochs"]
+    timeout = 600
+    # maximum number of values of the data matrix
+    max_values = 2 ** 25
+
+    def setup(self, n_channels, n_times, n_epochs):
+        skip_if_too_large(n_epochs * n_channels * n_times, self.max_values)
+        self.data = make_eeg(n_epochs, n_channels, n_times)
+
+
+class LempelZivComplexity(_MetricSuite):
+    # the LZW parsing runs in Python, one step per symbol
+    max_values = 2 ** 23
+
+    def time_lempel_ziv_complexity(self, *params):
+        lempel_ziv_complexity(self.data, random_state=0)
+
+    def peakmem_lempel_ziv_complexity(self, *params):
+        lempel_ziv_complexity(self.data, random_state=0)
+
+
+class AmplitudeCoalitionEntropy(_MetricSuite):
+
+    def time_amplitude_coalition_entropy(self, *params):
+        amplitude_coalition_entropy(self.data, random_state=0)
+
+    def peakmem_amplitude_coalition_entropy(self, *params):
+        amplitude_coalition_entropy(self.data, random_state=0)
+
+
+class SynchronyCoalitionEntropy(_MetricSuite):
+    # the synchrony matrix grows with n_channels ** 2 * n_times
+
+    def setup(self, n_channels, n_times, n_epochs):
+        skip_if_too_large(n_epochs * n_channels ** 2 * n_times, 2 ** 28)
+        super().setup(n_channels, n_times, n_epochs)
+
+    def time_synchrony_coalition_entropy(self, *params):
+        synchrony_coalition_entropy(self.data, random_state=0)
+
+    def peakmem_synchrony_coalition_entropy(self, *params):
+        synchrony_coalition_entropy(self.data, random_state=0)
+
+    def peakmem_synchrony_coalition_entropy_budget(self, *params):
+        synchrony_coalition_entropy(
+            self.data, random_state=0, memory_budget=2 ** 26)
+
+
+class ComputeMetrics(_MetricSuite):
+    max_values = 2 ** 23
+
+    def setup(self, n_channels, n_times, n_epochs):
+        skip_if_too_large(n_epochs * n_channels ** 2 * n_times, 2 ** 28)
+        super().setup(n_channels, n_times, n_epochs)
+
+    def time_compute_metrics(self, *params):
+        compute_metrics(self.data, random_state=0)
+
+    def peakmem_compute_metrics(self, *params):
+        compute_metrics(self.data, random_state=0)
+
+
+class ComputeEntropy(_MetricSuite):
+
+    def setup(self, n_channels, n_times, n_epochs):
+        super().setup(n_channels, n_times, n_epochs)
+        self.col_map = map_matrix_to_integer(
+            binarize_hilbert_amplitude(self.data))
+
+    def time_compute_entropy(self, *params):
+        compute_entropy(self.col_map)
+
+    def time_compute_entropy_miller_madow(self, *params):
+        compute_entropy(self.col_map, estimator="miller_madow")
+
+
+class ComputeMultiscaleMetrics(_MetricSuite):
+    # scales 1 to 5 compress about 2.3 times the samples of one scale
+    max_values = 2 ** 22
+
+    def time_compute_multiscale_metrics(self, *params):
+        compute_multiscale_metrics(self.data, scales=5, random_state=0)
+
+    def peakmem_compute_multiscale_metrics(self, *params):
+        compute_multiscale_metrics(self.data, scales=5, random_state=0)
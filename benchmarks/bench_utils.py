@@ -0,0 +1,93 @@
+"""Benchmarks of the preprocessing and binarization functions."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+from mecons.utils import (
+    binarize_hilbert_amplitude,
+    binary_matrix_to_string,
+    compute_synchrony_matrix,
+    create_random_binary_matrix,
+    detrending_normalization,
+    map_matrix_to_integer,
+    pack_binary_matrix
+)
+
+from .common import N_CHANNELS, N_TIMES, N_EPOCHS, make_eeg, skip_if_too_large
+
+
+class Preprocessing:
+    params = (N_CHANNELS, N_TIMES, N_EPOCHS)
+    param_names = ["n_channels", "n_times", "n_epochs"]
+    timeout = 600
+
+    def setup(self, n_channels, n_times, n_epochs):
+        skip_if_too_large(n_epochs * n_channels * n_times)
+        self.data = make_eeg(n_epochs, n_channels, n_times)
+        self.out = np.empty_like(self.data)
+
+    def time_detrending_normalization(self, *params):
+        detrending_normalization(self.data)
+
+    def time_detrending_normalization_out(self, *params):
+        detrending_normalization(self.data, out=self.out)
+
+    def peakmem_detrending_normalization(self, *params):
+        detrending_normalization(self.data)
+
+    def time_binarize_hilbert_amplitude(self, *params):
+        binarize_hilbert_amplitude(self.data)
+
+    def time_binarize_hilbert_amplitude_median(self, *params):
+        binarize_hilbert_amplitude(self.data, thr_method="median")
+
+    def time_binarize_hilbert_amplitude_float32(self, *params):
+        binarize_hilbert_amplitude(self.data, dtype=np.float32)
+
+    def peakmem_binarize_hilbert_amplitude(self, *params):
+        binarize_hilbert_amplitude(self.data)
+
+
+class SynchronyMatrix:
+    params = (N_CHANNELS, N_TIMES, N_EPOCHS)
+    param_names = ["n_channels", "n_times", "n_epochs"]
+    timeout = 600
+
+    def setup(self, n_channels, n_times, n_epochs):
+        # the synchrony matrix grows with n_channels ** 2 * n_times
+        skip_if_too_large(n_epochs * n_channels ** 2 * n_times, 2 ** 28)
+        self.data = make_eeg(n_epochs, n_channels, n_times)
+
+    def time_compute_synchrony_matrix(self, *params):
+        compute_synchrony_matrix(self.data, packed=True)
+
+    def peakmem_compute_synchrony_matrix(self, *params):
+        compute_synchrony_matrix(self.data, packed=True)
+
+
+class BinaryMatrix:
+    params = (N_CHANNELS, N_TIMES)
+    param_names = ["n_channels", "n_times"]
+    timeout = 600
+
+    def setup(self, n_channels, n_times):
+        skip_if_too_large(n_channels * n_times)
+        self.binary_matrix = create_random_binary_matrix(
+            n_channels, n_times, random_state=0)
+
+    def time_create_random_binary_matrix(self, n_channels, n_times):
+        create_random_binary_matrix(n_channels, n_times, random_state=0)
+
+    def time_map_matrix_to_integer(self, *params):
+        map_matrix_to_integer(self.binary_matrix)
+
+    def peakmem_map_matrix_to_integer(self, *params):
+        map_matrix_to_integer(self.binary_matrix)
+
+    def time_binary_matrix_to_string(self, *params):
+        binary_matrix_to_string(self.binary_matrix)
+
+    def time_pack_binary_matrix(self, *params):
+        pack_binary_matrix(self.binary_matrix)
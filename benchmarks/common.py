@@ -0,0 +1,71 @@
+"""Synthetic EEG and parameters shared by the benchmarks."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+N_CHANNELS = [4, 16, 64, 256]
+N_TIMES = [1000, 10000, 100000, 1000000]
+N_EPOCHS = [1, 10]
+
+# maximum number of values of the data matrix, (256, 1M) float64 is 2 GB
+MAX_VALUES = 2 ** 25
+
+
+def make_eeg(n_epochs, n_channels, n_times, sfreq=250., seed=0):
+    """Create reproducible EEG-like data.
+
+    Each source is pink (1/f) noise plus an alpha oscillation (8-12 Hz) with
+    random amplitude, and the channels are random mixtures of the sources,
+    so neighbouring channels are correlated as in real recordings.
+
+    Parameters
+    ----------
+    n_epochs : int
+        Number of epochs.
+    n_channels : int
+        Number of channels.
+    n_times : int
+        Number of samples per epoch.
+    sfreq : float, optional (default 250.)
+        Sampling frequency in Hz.
+    seed : int, optional (default 0)
+        Seed of the random generator, so the data is the same on all
+        machines.
+
+    Returns
+    -------
+    ndarray, shape (n_epochs, n_channels, n_times)
+        Data in volts.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_epochs, n_channels, n_times)
+
+    # pink noise: white noise with its spectrum scaled by 1 / sqrt(f)
+    freqs = np.fft.rfftfreq(n_times, 1. / sfreq)
+    scaling = np.zeros_like(freqs)
+    scaling[1:] = 1. / np.sqrt(freqs[1:])
+    spectrum = np.fft.rfft(rng.standard_normal(shape), axis=-1) * scaling
+    sources = np.fft.irfft(spectrum, n_times, axis=-1)
+    sources /= sources.std(axis=-1, keepdims=True)
+
+    # alpha oscillation with random frequency, phase and amplitude
+    times = np.arange(n_times) / sfreq
+    alpha_freq = rng.uniform(8., 12., (n_epochs, n_channels, 1))
+    alpha_phase = rng.uniform(0., 2 * np.pi, (n_epochs, n_channels, 1))
+    alpha_amplitude = rng.uniform(0., 2., (n_epochs, n_channels, 1))
+    sources += alpha_amplitude * np.sin(
+        2 * np.pi * alpha_freq * times + alpha_phase)
+
+    # mix the sources, each channel is dominated by its own source
+    mixing = np.eye(n_channels) + 0.3 * rng.standard_normal(
+        (n_channels, n_channels)) / np.sqrt(n_channels)
+
+    return 1e-5 * np.matmul(mixing, sources)
+
+
+def skip_if_too_large(n_values, max_values=MAX_VALUES):
+    """Skip the benchmark (see asv) if it needs too many values."""
+    if n_values > max_values:
+        raise NotImplementedError("Too large for the benchmark machine.")
@@ -6,3 +6,4 @@ from ._version import __version__
 
 from . import complexity
 from . import utils
+from .utils.backend import set_backend, get_backend
@@ -2,6 +2,10 @@
 # Authors: Christian Ferreyra, chrisferreyra13@gmail.com
 # License: BSD-3-Clause
 
-from .compressibility import lempel_ziv_complexity
+from .compressibility import (lempel_ziv_complexity,
+                              windowed_lempel_ziv_complexity)
 from .entropy import (amplitude_coalition_entropy, synchrony_coalition_entropy,
-                      compute_entropy)
+                      compute_entropy, windowed_amplitude_coalition_entropy)
+from .metrics import compute_metrics
+from .epochs import compute_epochs_metrics
+from .multiscale import compute_multiscale_metrics
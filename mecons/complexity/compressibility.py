@@ -7,12 +7,21 @@
 # License : BSD-3-Clause
 
 import numpy as np
-from random import shuffle
 
-from ..utils.preprocessing import detrending_normalization
+from ..utils.preprocessing import (
+    detrending_normalization,
+    _add_epochs_axis,
+    _analytic_signal
+)
+from ..utils.parallel import _get_epoch_seeds, _parallel_over_epochs
+from ..utils.chunks import _is_mne_data
+from ..utils.profiling import _start_stage, _end_stage
+from ..utils.backend import _get_kernels
+from ..utils.baseline import _check_n_surrogates
 from ..utils.binary import (
-    binary_matrix_to_string,
-    binarize_hilbert_amplitude
+    binarize_hilbert_amplitude,
+    PackedBinaryMatrix,
+    _window_thresholds
 )
 
 
@@ -47,41 +56,444 @@ def _lempel_ziv_welch_compression(binary_string):
     return len(dictionary)
 
 
-def lempel_ziv_complexity(data):
+def _lempel_ziv_welch_trie(binary_buffer):
+    """Return the size of the dictionary of binary words after compression.
+
+    Same as _lempel_ziv_welch_compression, but the dictionary is an
+    integer-coded trie, so no substrings are allocated. Node 0 is the empty
+    word and the children of node k are stored at 2k and 2k + 1.
+
+    Note: Only the first symbol is added to the dictionary as a one-symbol
+    word, so the nodes of both one-symbol words are created beforehand and
+    not counted.
+
+    Parameters
+    ----------
+    binary_buffer : ndarray of uint8, shape (n_symbols,) or bytes
+        Binary sequence (values 0 and 1) to be compressed.
+
+    Returns
+    -------
+    int
+        Size of the dictionary of binary words.
+    """
+    binary_buffer = _check_binary_buffer(binary_buffer)
+    if binary_buffer.size == 0:
+        return 0
+
+    kernels = _get_kernels()
+    if kernels is not None:
+        return int(kernels.lzw_dictionary_size(
+            np.ascontiguousarray(binary_buffer, dtype=np.uint8)))
+
+    children = [1, 2, 0, 0, 0, 0]
+    n_nodes = 3
+    symbols = binary_buffer.tolist()
+    node = children[symbols[0]]
+    for c in symbols[1:]:
+        child = children[2 * node + c]
+        if child:
+            node = child
+        else:
+            # add the new word and start again from the current symbol
+            children[2 * node + c] = n_nodes
+            children.extend((0, 0))
+            n_nodes += 1
+            node = children[c]
+
+    return n_nodes - 2
+
+
+def _lempel_ziv_76(binary_buffer):
+    """Return the number of phrases of the LZ76 parsing.
+
+    Based on the Kaspar-Schuster algorithm (Lempel and Ziv 1976): each new
+    phrase is the shortest word, starting after the previous phrase, that
+    is not a copy of a word starting earlier in the sequence (overlaps
+    allowed). The last phrase is counted even if it is a copy.
+
+    A suffix automaton of the sequence is built in linear time, with the
+    first end position of each state. A phrase is extended while the
+    automaton has the next symbol and the word has an earlier occurrence,
+    so the whole parsing is also linear in the number of symbols.
+
+    Parameters
+    ----------
+    binary_buffer : ndarray of uint8, shape (n_symbols,) or bytes
+        Binary sequence (values 0 and 1) to be parsed.
+
+    Returns
+    -------
+    int
+        Number of phrases (LZ76 complexity).
+    """
+    binary_buffer = _check_binary_buffer(binary_buffer)
+    if binary_buffer.size == 0:
+        return 0
+
+    kernels = _get_kernels()
+    if kernels is not None:
+        return int(kernels.lz76_complexity(
+            np.ascontiguousarray(binary_buffer, dtype=np.uint8)))
+
+    symbols = binary_buffer.tolist()
+    n_symbols = len(symbols)
+
+    # suffix automaton: the transitions of state k are stored at 2k and
+    # 2k + 1, -1 if missing
+    max_states = 2 * n_symbols + 1
+    transitions = [-1] * (2 * max_states)
+    links = [-1] * max_states
+    lengths = [0] * max_states
+    first_ends = [0] * max_states
+    n_states, last = 1, 0
+    for end, c in enumerate(symbols):
+        state = n_states
+        n_states += 1
+        lengths[state] = lengths[last] + 1
+        first_ends[state] = end
+        p = last
+        while p != -1 and transitions[2 * p + c] == -1:
+            transitions[2 * p + c] = state
+            p = links[p]
+        if p == -1:
+            links[state] = 0
+        else:
+            q = transitions[2 * p + c]
+            if lengths[p] + 1 == lengths[q]:
+                links[state] = q
+            else:
+                clone = n_states
+                n_states += 1
+                lengths[clone] = lengths[p] + 1
+                transitions[2 * clone] = transitions[2 * q]
+                transitions[2 * clone + 1] = transitions[2 * q + 1]
+                links[clone] = links[q]
+                first_ends[clone] = first_ends[q]
+                while p != -1 and transitions[2 * p + c] == q:
+                    transitions[2 * p + c] = clone
+                    p = links[p]
+                links[q] = clone
+                links[state] = clone
+        last = state
+
+    n_phrases, start = 0, 0
+    while start < n_symbols:
+        # extend the copy while the word also starts before the phrase
+        state, length = 0, 0
+        while start + length < n_symbols:
+            state = transitions[2 * state + symbols[start + length]]
+            if state == -1 or first_ends[state] >= start + length:
+                break
+            length += 1
+        n_phrases += 1
+        start += length + 1
+
+    return n_phrases
+
+
+def _check_binary_buffer(binary_buffer):
+    """Check a binary sequence and return it as a 1D ndarray.
+
+    Parameters
+    ----------
+    binary_buffer : ndarray of int or bytes
+        Binary sequence (values 0 and 1).
+
+    Returns
+    -------
+    ndarray of int, shape (n_symbols,)
+        Binary sequence.
+    """
+    if isinstance(binary_buffer, (bytes, bytearray)):
+        binary_buffer = np.frombuffer(binary_buffer, dtype=np.uint8)
+
+    if (not isinstance(binary_buffer, np.ndarray)
+            or binary_buffer.dtype.kind not in "biu"):
+        raise TypeError("The input should be a ndarray of integers or bytes.")
+
+    binary_buffer = binary_buffer.ravel()
+    if binary_buffer.size and (binary_buffer.min() < 0
+                               or binary_buffer.max() > 1):
+        raise ValueError("The input should be binary.")
+
+    return binary_buffer
+
+
+# compression of the binary sequences per method of lempel_ziv_complexity
+_LZ_METHODS = dict(lzw=_lempel_ziv_welch_trie, lz76=_lempel_ziv_76)
+
+
+def lempel_ziv_complexity(data, random_state=None, n_jobs=1, n_surrogates=1,
+                          return_surrogates=False, batch_size=None,
+                          dtype=np.float64, method="lzw", pad=False,
+                          workers=None):
     """Compute LZc.
 
-    Note: The shuffled result is used as normalization.
+    Note: The shuffled result is used as normalization. With several
+    surrogates, the mean of the shuffled results is used.
     Metric defined in Schartner et al. 2015.
 
+    Parameters
+    ----------
+    data : ndarray or PackedBinaryMatrix, shape (n_channels, n_times)
+        Mulidimensional time series matrix. If PackedBinaryMatrix, the data
+        is considered already binarized. If 3D, with shape
+        (n_epochs, n_channels, n_times), LZc is computed per epoch. It can
+        also be a MNE Raw or Epochs object, and Epochs (or np.memmap) opened
+        without loading the data are read in chunks of epochs.
+    random_state : None | int | instance of Generator, optional
+        Random state used to shuffle the data for normalization. Each epoch
+        gets its own seed derived from it. If None (default), the seed is
+        drawn from the global numpy random state.
+    n_jobs : int | None, optional (default 1)
+        The number of jobs to run in parallel over epochs. If -1, it is set
+        to the number of CPU cores.
+    n_surrogates : int, optional (default 1)
+        Number of shuffled sequences used for normalization. All of them are
+        drawn at once with the random state.
+    return_surrogates : bool, optional (default False)
+        If True, also returns the mean and the standard deviation of the
+        dictionary sizes of the shuffled sequences.
+    batch_size : int | None, optional (default None)
+        Maximum number of epochs loaded and processed at once. If None,
+        np.memmap and MNE Epochs are processed one epoch at a time, and
+        other data all at once (one chunk per job).
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
+    method : str, optional (default "lzw")
+        Compression of the binary sequence. If 'lzw', the size of the
+        dictionary of Lempel-Ziv-Welch compression. If 'lz76', the number
+        of phrases of the Lempel-Ziv 1976 parsing (Kaspar-Schuster
+        algorithm), computed in linear time with a suffix automaton.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform, which is faster for lengths with large
+        prime factors but changes the values slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
+
+    Returns
+    -------
+    lzc : float or ndarray, shape (n_epochs,)
+        Lempel-Ziv complexity value (between 0 and 1).
+    surrogate_mean : float or ndarray, shape (n_epochs,)
+        Mean dictionary size (number of phrases for 'lz76') of the shuffled
+        sequences. Only returned if return_surrogates is True.
+    surrogate_std : float or ndarray, shape (n_epochs,)
+        Standard deviation of the dictionary sizes (number of phrases for
+        'lz76') of the shuffled sequences. Only returned if
+        return_surrogates is True.
+    """
+    if not (isinstance(data, (np.ndarray, PackedBinaryMatrix))
+            or _is_mne_data(data)):
+        raise TypeError("Data matrix should be a ndarray of float values.")
+
+    _check_n_surrogates(n_surrogates)
+    _check_lz_method(method)
+
+    data, is_epoched = _add_epochs_axis(data)
+    _, epoch_seeds = _get_epoch_seeds(random_state, len(data))
+
+    lzc_values, surrogate_mean, surrogate_std = _parallel_over_epochs(
+        _lempel_ziv_complexity_epochs, data, epoch_seeds, n_jobs=n_jobs,
+        batch_size=batch_size, n_surrogates=n_surrogates, dtype=dtype,
+        method=method, pad=pad, workers=workers)
+
+    if not is_epoched:
+        lzc_values = lzc_values[0]
+        surrogate_mean, surrogate_std = surrogate_mean[0], surrogate_std[0]
+
+    if return_surrogates:
+        return lzc_values, surrogate_mean, surrogate_std
+
+    return lzc_values
+
+
+def _lempel_ziv_complexity_epochs(data, epoch_seeds, n_surrogates=1,
+                                  dtype=np.float64, method="lzw", pad=False,
+                                  workers=None):
+    """Preprocess the data and compute LZc per epoch."""
+    if isinstance(data, np.ndarray):
+        data = detrending_normalization(data, dtype=dtype)
+        data = binarize_hilbert_amplitude(
+            data, dtype=None, pad=pad, workers=workers)
+    else:
+        data = data.unpack()
+
+    return _lempel_ziv_complexity_binary(
+        data, epoch_seeds, n_surrogates=n_surrogates, return_surrogates=True,
+        method=method)
+
+
+def _lempel_ziv_complexity_binary(data, epoch_seeds, n_surrogates=1,
+                                  return_surrogates=False, method="lzw"):
+    """Compute LZc from the binarized Hilbert amplitude matrix.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_epochs, n_channels, n_times)
+        Binarized data matrix.
+    epoch_seeds : list of SeedSequence
+        Seed per epoch used to shuffle the data for normalization.
+    n_surrogates : int, optional (default 1)
+        Number of shuffled sequences used for normalization.
+    return_surrogates : bool, optional (default False)
+        If True, also returns the mean and the standard deviation of the
+        dictionary sizes of the shuffled sequences.
+    method : str, optional (default "lzw")
+        Compression of the binary sequences, 'lzw' or 'lz76'.
+
+    Returns
+    -------
+    lzc_values : ndarray, shape (n_epochs,)
+        Lempel-Ziv complexity value (between 0 and 1).
+    surrogate_mean : ndarray, shape (n_epochs,)
+        Only returned if return_surrogates is True.
+    surrogate_std : ndarray, shape (n_epochs,)
+        Only returned if return_surrogates is True.
+    """
+    n_epochs = data.shape[0]
+    lzc_values = np.zeros(n_epochs)
+    surrogate_mean = np.zeros(n_epochs)
+    surrogate_std = np.zeros(n_epochs)
+    for epoch_idx in range(n_epochs):
+        # concatenate the binary matrix column-by-column (a view if the
+        # matrix is column-major, see binarize_hilbert_amplitude)
+        binary_buffer = data[epoch_idx].ravel(order="F")
+        if binary_buffer.dtype.itemsize == 1:
+            binary_buffer = binary_buffer.view(np.uint8)
+
+        # compute LZc
+        start_stage = _start_stage()
+        lzc_value = _LZ_METHODS[method](binary_buffer)
+        _end_stage(method, start_stage, binary_buffer)
+
+        # compress random sequences for normalization
+        start_stage = _start_stage()
+        rng = np.random.default_rng(epoch_seeds[epoch_idx])
+        surrogate_sizes = _permuted_dictionary_sizes(
+            binary_buffer, n_surrogates, rng, method=method)
+        _end_stage("surrogates", start_stage, surrogate_sizes)
+
+        # normalize
+        surrogate_mean[epoch_idx] = np.mean(surrogate_sizes)
+        surrogate_std[epoch_idx] = np.std(surrogate_sizes)
+        lzc_values[epoch_idx] = lzc_value / surrogate_mean[epoch_idx]
+
+    if return_surrogates:
+        return lzc_values, surrogate_mean, surrogate_std
+
+    return lzc_values
+
+
+def _permuted_dictionary_sizes(binary_buffer, n_surrogates, rng,
+                               method="lzw"):
+    """Compress several shuffled versions of a binary sequence.
+
+    All the permutations are drawn at once with Generator.permuted.
+
+    Parameters
+    ----------
+    binary_buffer : ndarray, shape (n_symbols,)
+        Binary sequence.
+    n_surrogates : int
+        Number of shuffled sequences.
+    rng : instance of Generator
+        Random generator used to shuffle the sequence.
+    method : str, optional (default "lzw")
+        Compression of the sequences, 'lzw' or 'lz76'.
+
+    Returns
+    -------
+    ndarray of int, shape (n_surrogates,)
+        Size of the dictionary of binary words per shuffled sequence.
+    """
+    surrogates = np.repeat(binary_buffer[np.newaxis], n_surrogates, axis=0)
+    rng.permuted(surrogates, axis=-1, out=surrogates)
+
+    compress = _LZ_METHODS[method]
+
+    return np.array([compress(surrogate) for surrogate in surrogates])
+
+
+def _check_lz_method(method):
+    """Check the compression method of LZc."""
+    if method not in _LZ_METHODS:
+        raise ValueError(
+            "The parameter method should be %s."
+            % " or ".join("'%s'" % name for name in _LZ_METHODS))
+
+
+def windowed_lempel_ziv_complexity(data, window_size, step, thr_method="mean",
+                                   random_state=None, method="lzw",
+                                   dtype=np.float64):
+    """Compute LZc over sliding windows.
+
+    The data is detrended and Hilbert-transformed once for the whole
+    recording, and the Hilbert amplitude is binarized in each window with
+    the threshold of that window. The LZW parsing depends on where the
+    window starts, so the compression is computed per window.
+
     Parameters
     ----------
     data : ndarray, shape (n_channels, n_times)
         Mulidimensional time series matrix.
+    window_size : int
+        Number of samples per window.
+    step : int
+        Number of samples between the starts of two consecutive windows.
+    thr_method : str, optional (default "mean")
+        If 'mean', the mean value of the Hilbert amplitude in the window is
+        used as threshold. If 'median' the median value is used.
+    random_state : None | int | instance of Generator, optional
+        Random state used to shuffle the data for normalization. Each window
+        gets its own seed derived from it. If None (default), the seed is
+        drawn from the global numpy random state.
+    method : str, optional (default "lzw")
+        Compression of the binary sequences, 'lzw' or 'lz76' (see
+        lempel_ziv_complexity).
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
 
     Returns
     -------
-    float
-        Lempel-Ziv complexity value (between 0 and 1).
+    ndarray, shape (n_windows,)
+        Lempel-Ziv complexity value (between 0 and 1) per window. The window
+        k starts at sample k * step.
     """
     if not isinstance(data, np.ndarray):
-        TypeError("Data matrix should be a ndarray of float values.")
+        raise TypeError("Data matrix should be a ndarray of float values.")
 
-    data = detrending_normalization(data)
-    data = binarize_hilbert_amplitude(data)
-    binary_str = binary_matrix_to_string(data)
+    if data.ndim != 2:
+        raise ValueError(
+            "Data matrix should have shape (n_channels, n_times).")
 
-    # compute LZc
-    lzc_value = _lempel_ziv_welch_compression(binary_str)
+    _check_lz_method(method)
 
-    # create random string for normalization
-    random_list = list(binary_str)
-    shuffle(random_list)
-    random_str = ""
-    for c in random_list:
-        random_str += c
+    hilbert_amplitude_matrix = np.abs(
+        _analytic_signal(detrending_normalization(data, dtype=dtype)))
+    thresholds = _window_thresholds(
+        hilbert_amplitude_matrix, window_size, step, thr_method=thr_method)
+    n_windows = thresholds.shape[-1]
+    _, window_seeds = _get_epoch_seeds(random_state, n_windows)
 
-    # normalize
-    norm_value = float(_lempel_ziv_welch_compression(random_str))
-    lzc_value_normalized = lzc_value / norm_value
+    lzc_values = np.zeros(n_windows)
+    for window_idx in range(n_windows):
+        start = window_idx * step
+        # binarize the window with its (n_channels, 1) threshold
+        binary_matrix = (
+            hilbert_amplitude_matrix[:, start:start + window_size]
+            >= thresholds[:, window_idx, np.newaxis]
+        ).astype(np.int8)
+        lzc_values[window_idx] = _lempel_ziv_complexity_binary(
+            binary_matrix[np.newaxis], window_seeds[window_idx:window_idx + 1],
+            method=method
+        )[0]
 
-    return lzc_value_normalized
+    return lzc_values
@@ -6,30 +6,56 @@
 # Date: 09.12.14 - 2022
 # License : BSD-3-Clause
 
-from random import shuffle
 import numpy as np
+from scipy.special import gammaln
 
-from ..utils.preprocessing import detrending_normalization
+from ..utils.preprocessing import (
+    detrending_normalization,
+    _add_epochs_axis,
+    _analytic_signal
+)
+from ..utils.parallel import _get_epoch_seeds, _parallel_over_epochs
+from ..utils.chunks import _epochs_shape, _is_mne_data
+from ..utils.profiling import _start_stage, _end_stage
+from ..utils.baseline import (
+    _cached_baseline,
+    _check_n_surrogates,
+    _get_cache_seed
+)
 from ..utils.binary import (
     binarize_hilbert_amplitude,
     compute_synchrony_matrix,
     create_random_binary_matrix,
     map_matrix_to_integer,
+    PackedBinaryMatrix,
+    _channel_synchrony_from_analytic,
+    _check_windows,
+    _window_thresholds
 )
 
+# approximate number of bytes used per value of a synchrony block,
+# including the temporary products (the column codes are counted apart)
+_SYNCHRONY_BYTES_PER_VALUE = 40
+
 
-def compute_entropy(data):
+def compute_entropy(data, estimator="plugin"):
     """Compute the Shannon entropy of a list of numbers/strings.
 
     Parameters
     ----------
-    data : list or ndarray, shape (n_values,)
-        List of numbers/strings to compute Shannon entropy.
+    data : list or ndarray, shape (n_values,) or (n_rows, n_values)
+        List of numbers/strings to compute Shannon entropy. If 2D, the
+        entropy of each row is computed.
+    estimator : str, optional (default "plugin")
+        If 'plugin', the entropy of the observed frequencies is used. If
+        'miller_madow', the Miller-Madow bias correction
+        (n_bins - 1) / (2 * n_values) (in nats) is added, where n_bins is
+        the number of distinct values.
 
     Returns
     -------
-    float
-        Entropy value.
+    float or ndarray, shape (n_rows,)
+        Entropy value, or entropy value per row.
     """
     if not isinstance(data, list) and not isinstance(data, np.ndarray):
         raise TypeError("The input should be a list or a numpy array.")
@@ -37,38 +63,203 @@ def compute_entropy(data):
     if isinstance(data, list):
         data = np.array(data)
 
-    # get frequency of each item in list
-    _, counts = np.unique(data, return_counts=True)
+    if data.ndim not in [1, 2]:
+        raise ValueError("The input should be 1D or 2D.")
+
+    if estimator not in ["plugin", "miller_madow"]:
+        raise ValueError(
+            "The parameter estimator should be 'plugin' or 'miller_madow'.")
+
+    start_stage = _start_stage()
+    data_2d = np.atleast_2d(data)
+    n_rows, n_values = data_2d.shape
+
+    # get frequency of each item per row
+    row_idx, counts = _count_values(data_2d)
 
     # compute probability of each unique item
-    probabilities = [float(c)/len(data) for c in counts]
-    entropy = -sum([p * np.log2(p) for p in probabilities])
+    probabilities = counts / float(n_values)
+    entropy = -np.bincount(
+        row_idx,
+        weights=probabilities * np.log2(probabilities),
+        minlength=n_rows
+    )
+
+    if estimator == "miller_madow":
+        n_bins = np.bincount(row_idx, minlength=n_rows)
+        entropy += (n_bins - 1) / (2. * n_values * np.log(2))
+
+    _end_stage("entropy", start_stage, entropy)
+
+    if data.ndim == 1:
+        return entropy[0]
 
     return entropy
 
 
-def amplitude_coalition_entropy(data):
+def _count_values(data):
+    """Count the occurrences of each distinct value in each row.
+
+    Non-negative integers with a bounded range are counted with np.bincount
+    in O(n). Other values are sorted and the runs of equal values counted.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_rows, n_values)
+        Values to count.
+
+    Returns
+    -------
+    row_idx : ndarray of int
+        Row of each distinct value, in increasing order of row and value.
+    counts : ndarray of int
+        Number of occurrences of each distinct value.
+    """
+    n_rows, n_values = data.shape
+
+    if data.dtype.kind in "biu" and data.size:
+        n_bins = int(data.max()) + 1
+        if data.min() >= 0 and n_rows * n_bins <= max(4 * data.size, 2**16):
+            # one bincount for all the rows, with an offset per row
+            offsets = np.arange(n_rows)[:, np.newaxis] * n_bins
+            counts = np.bincount(
+                (data.astype(np.intp, copy=False) + offsets).ravel(),
+                minlength=n_rows * n_bins)
+            nonzero_idx = np.flatnonzero(counts)
+            return nonzero_idx // n_bins, counts[nonzero_idx]
+
+    # runs of equal values in the sorted rows
+    sorted_data = np.sort(data, axis=-1)
+    is_first = np.ones(sorted_data.shape, dtype=bool)
+    is_first[:, 1:] = sorted_data[:, 1:] != sorted_data[:, :-1]
+    first_idx = np.flatnonzero(is_first)
+    counts = np.diff(np.append(first_idx, sorted_data.size))
+
+    return first_idx // n_values, counts
+
+
+def amplitude_coalition_entropy(data, random_state=None, n_jobs=1,
+                                n_surrogates=1, return_surrogates=False,
+                                batch_size=None, dtype=np.float64, pad=False,
+                                workers=None):
     """Compute Amplitude Coalition Entropy (ACE).
 
-    Note: The shuffled result is used as normalization.
+    Note: The shuffled result is used as normalization. With several
+    surrogates, the mean of the shuffled results is used.
     Metric defined in Schartner et al. 2015.
 
     Parameters
     ----------
-    data : ndarray, shape (n_channels, n_times)
-        Mulidimensional time series matrix.
+    data : ndarray or PackedBinaryMatrix, shape (n_channels, n_times)
+        Mulidimensional time series matrix. If PackedBinaryMatrix, the data
+        is considered already binarized. If 3D, with shape
+        (n_epochs, n_channels, n_times), ACE is computed per epoch. It can
+        also be a MNE Raw or Epochs object, and Epochs (or np.memmap) opened
+        without loading the data are read in chunks of epochs.
+    random_state : None | int | instance of Generator, optional
+        Random state used to shuffle the data for normalization. Each epoch
+        gets its own seed derived from it. If None (default), the seed is
+        drawn from the global numpy random state.
+    n_jobs : int | None, optional (default 1)
+        The number of jobs to run in parallel over epochs. If -1, it is set
+        to the number of CPU cores.
+    n_surrogates : int, optional (default 1)
+        Number of shuffled matrices used for normalization. All of them are
+        drawn at once with the random state.
+    return_surrogates : bool, optional (default False)
+        If True, also returns the mean and the standard deviation of the
+        entropy of the shuffled matrices.
+    batch_size : int | None, optional (default None)
+        Maximum number of epochs loaded and processed at once. If None,
+        np.memmap and MNE Epochs are processed one epoch at a time, and
+        other data all at once (one chunk per job).
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform, which is faster for lengths with large
+        prime factors but changes the values slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
 
     Returns
     -------
-    float
+    ace : float or ndarray, shape (n_epochs,)
         Amplitude coalition entropy value (between 0 and 1).
+    surrogate_mean : float or ndarray, shape (n_epochs,)
+        Mean entropy of the shuffled matrices. Only returned if
+        return_surrogates is True.
+    surrogate_std : float or ndarray, shape (n_epochs,)
+        Standard deviation of the entropy of the shuffled matrices. Only
+        returned if return_surrogates is True.
     """
-    if not isinstance(data, np.ndarray):
+    if not (isinstance(data, (np.ndarray, PackedBinaryMatrix))
+            or _is_mne_data(data)):
         raise TypeError("Data matrix should be a ndarray of float values.")
 
-    data = detrending_normalization(data)
-    data = binarize_hilbert_amplitude(data)
+    _check_n_surrogates(n_surrogates)
+
+    data, is_epoched = _add_epochs_axis(data)
+    _, epoch_seeds = _get_epoch_seeds(random_state, len(data))
+
+    ace_values, surrogate_mean, surrogate_std = _parallel_over_epochs(
+        _amplitude_coalition_entropy_epochs, data, epoch_seeds, n_jobs=n_jobs,
+        batch_size=batch_size, n_surrogates=n_surrogates, dtype=dtype,
+        pad=pad, workers=workers)
+
+    if not is_epoched:
+        ace_values = ace_values[0]
+        surrogate_mean, surrogate_std = surrogate_mean[0], surrogate_std[0]
+
+    if return_surrogates:
+        return ace_values, surrogate_mean, surrogate_std
+
+    return ace_values
+
+
+def _amplitude_coalition_entropy_epochs(data, epoch_seeds, n_surrogates=1,
+                                        dtype=np.float64, pad=False,
+                                        workers=None):
+    """Preprocess the data and compute ACE per epoch."""
+    if isinstance(data, np.ndarray):
+        data = detrending_normalization(data, dtype=dtype)
+        data = binarize_hilbert_amplitude(
+            data, dtype=None, pad=pad, workers=workers)
+    else:
+        data = data.unpack()
+
+    return _amplitude_coalition_entropy_binary(
+        data, epoch_seeds, n_surrogates=n_surrogates, return_surrogates=True)
+
+
+def _amplitude_coalition_entropy_binary(data, epoch_seeds, n_surrogates=1,
+                                        return_surrogates=False):
+    """Compute ACE from the binarized Hilbert amplitude matrix.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_epochs, n_channels, n_times)
+        Binarized data matrix.
+    epoch_seeds : list of SeedSequence
+        Seed per epoch used to shuffle the data for normalization.
+    n_surrogates : int, optional (default 1)
+        Number of shuffled matrices used for normalization.
+    return_surrogates : bool, optional (default False)
+        If True, also returns the mean and the standard deviation of the
+        entropy of the shuffled matrices.
 
+    Returns
+    -------
+    ace_values : ndarray, shape (n_epochs,)
+        Amplitude coalition entropy value (between 0 and 1).
+    surrogate_mean : ndarray, shape (n_epochs,)
+        Only returned if return_surrogates is True.
+    surrogate_std : ndarray, shape (n_epochs,)
+        Only returned if return_surrogates is True.
+    """
     try:
         col_map = map_matrix_to_integer(data)
     except ValueError as ex:
@@ -77,63 +268,512 @@ def amplitude_coalition_entropy(data):
     # compute ace value (not normalized)
     ace_value = compute_entropy(col_map)
 
-    # shuffle the data for normalization
-    n_channels, _ = np.shape(data)
-    for ch_idx in range(n_channels):
-        shuffle(data[ch_idx])
+    # shuffle each channel of n_surrogates copies of the epoch at once
+    start_stage = _start_stage()
+    surrogate_values = np.zeros((len(epoch_seeds), n_surrogates))
+    for epoch_idx, epoch_seed in enumerate(epoch_seeds):
+        rng = np.random.default_rng(epoch_seed)
+        surrogates = np.repeat(
+            data[epoch_idx][np.newaxis], n_surrogates, axis=0)
+        rng.permuted(surrogates, axis=-1, out=surrogates)
+        surrogate_values[epoch_idx] = compute_entropy(
+            map_matrix_to_integer(surrogates))
+
+    _end_stage("surrogates", start_stage, surrogate_values)
+
+    # normalize, the entropy is 0 if every channel is constant
+    surrogate_mean = np.mean(surrogate_values, axis=-1)
+    ace_value_normalized = np.divide(
+        ace_value, surrogate_mean, out=np.zeros(len(epoch_seeds)),
+        where=surrogate_mean > 0)
+
+    if return_surrogates:
+        return (ace_value_normalized, surrogate_mean,
+                np.std(surrogate_values, axis=-1))
 
-    shuffled_ace_value = compute_entropy(map_matrix_to_integer(data))
+    return ace_value_normalized
 
-    # normalize
-    ace_value_normalized = ace_value / float(shuffled_ace_value)
 
-    return ace_value_normalized
+def windowed_amplitude_coalition_entropy(data, window_size, step,
+                                         thr_method="mean",
+                                         random_state=None,
+                                         dtype=np.float64, per_window=False):
+    """Compute ACE over sliding windows.
+
+    The data is detrended and Hilbert-transformed once for the whole
+    recording. By default, it is also binarized and its columns are mapped
+    to integers once. Then, the histogram of the column codes and the
+    entropy are updated as the window moves, adding the incoming columns
+    and removing the outgoing ones, so the cost is O(n_times) whatever the
+    window size.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_channels, n_times)
+        Mulidimensional time series matrix.
+    window_size : int
+        Number of samples per window.
+    step : int
+        Number of samples between the starts of two consecutive windows.
+    thr_method : str, optional (default "mean")
+        If 'mean', the mean value of the Hilbert amplitude is used as
+        threshold. If 'median' the median value is used.
+    random_state : None | int | instance of Generator, optional
+        Random state used to shuffle the data for normalization. If None
+        (default), the seed is drawn from the global numpy random state.
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
+    per_window : bool, optional (default False)
+        If False, the thresholds are computed over the whole recording and
+        each channel is shuffled once over the whole recording for
+        normalization. If True, each window is binarized with its own
+        thresholds and shuffled with its own seed (derived from
+        random_state), as in windowed_lempel_ziv_complexity. Each window is
+        then coded and counted from scratch, so the cost is
+        O(n_windows * window_size).
+
+    Returns
+    -------
+    ndarray, shape (n_windows,)
+        Amplitude coalition entropy value (between 0 and 1) per window. The
+        window k starts at sample k * step. ACE is 0 in windows where every
+        channel is constant after binarization.
+    """
+    if not isinstance(data, np.ndarray):
+        raise TypeError("Data matrix should be a ndarray of float values.")
+
+    if data.ndim != 2:
+        raise ValueError(
+            "Data matrix should have shape (n_channels, n_times).")
+
+    if per_window:
+        return _windowed_amplitude_coalition_entropy_per_window(
+            data, window_size, step, thr_method=thr_method,
+            random_state=random_state, dtype=dtype)
+
+    _check_windows(window_size, step, data.shape[-1])
 
+    data = detrending_normalization(data, dtype=dtype)
+    data = binarize_hilbert_amplitude(data, thr_method=thr_method, dtype=None)
 
-def synchrony_coalition_entropy(data, per_channel=False):
+    # compute ace values (not normalized)
+    ace_values = _windowed_entropy(
+        map_matrix_to_integer(data), window_size, step)
+
+    # shuffle each channel for normalization
+    _, (seed,) = _get_epoch_seeds(random_state, 1)
+    np.random.default_rng(seed).permuted(data, axis=-1, out=data)
+    shuffled_ace_values = _windowed_entropy(
+        map_matrix_to_integer(data), window_size, step)
+
+    # the entropy is 0 in windows where every channel is constant
+    return np.divide(ace_values, shuffled_ace_values,
+                     out=np.zeros(len(ace_values)),
+                     where=shuffled_ace_values > 0)
+
+
+def _windowed_entropy(col_map, window_size, step):
+    """Compute the entropy of sliding windows with a rolling histogram.
+
+    The entropy of a window with counts c_k is
+    log2(n) - sum_k(c_k * log2(c_k)) / n, so only the running sum has to be
+    updated for each column entering or leaving the window.
+
+    Parameters
+    ----------
+    col_map : ndarray, shape (n_values,)
+        Values to compute Shannon entropy.
+    window_size : int
+        Number of values per window.
+    step : int
+        Number of values between the starts of two consecutive windows.
+
+    Returns
+    -------
+    ndarray, shape (n_windows,)
+        Entropy value per window.
+    """
+    start_stage = _start_stage()
+
+    # map the values to 0, ..., n_unique - 1 to index the histogram
+    unique_values, codes = np.unique(col_map, return_inverse=True)
+    codes = codes.ravel().tolist()
+    counts = [0] * len(unique_values)
+    c_log_c = (np.arange(window_size + 1)
+               * np.log2(np.maximum(np.arange(window_size + 1), 1))).tolist()
+
+    n_windows = (len(codes) - window_size) // step + 1
+    entropy = np.zeros(n_windows)
+    c_log_c_sum = 0.0
+    end = 0
+    for window_idx in range(n_windows):
+        start = window_idx * step
+        # remove the columns leaving the window
+        if window_idx > 0:
+            for code in codes[start - step:min(start, end)]:
+                c_log_c_sum -= c_log_c[counts[code]]
+                counts[code] -= 1
+                c_log_c_sum += c_log_c[counts[code]]
+        # add the columns entering the window
+        for code in codes[max(start, end):start + window_size]:
+            c_log_c_sum -= c_log_c[counts[code]]
+            counts[code] += 1
+            c_log_c_sum += c_log_c[counts[code]]
+        end = start + window_size
+
+        entropy[window_idx] = np.log2(window_size) - c_log_c_sum / window_size
+
+    # the running sum can have a tiny rounding error with a single value
+    entropy = np.maximum(entropy, 0)
+
+    _end_stage("entropy", start_stage, entropy)
+
+    return entropy
+
+
+def _windowed_amplitude_coalition_entropy_per_window(data, window_size, step,
+                                                     thr_method="mean",
+                                                     random_state=None,
+                                                     dtype=np.float64):
+    """Compute ACE over sliding windows binarized with their own thresholds.
+
+    See windowed_amplitude_coalition_entropy with per_window=True.
+    """
+    hilbert_amplitude_matrix = np.abs(
+        _analytic_signal(detrending_normalization(data, dtype=dtype)))
+    thresholds = _window_thresholds(
+        hilbert_amplitude_matrix, window_size, step, thr_method=thr_method)
+    n_windows = thresholds.shape[-1]
+    _, window_seeds = _get_epoch_seeds(random_state, n_windows)
+
+    ace_values = np.zeros(n_windows)
+    for window_idx in range(n_windows):
+        start = window_idx * step
+        # binarize the window with its (n_channels, 1) threshold
+        binary_matrix = (
+            hilbert_amplitude_matrix[:, start:start + window_size]
+            >= thresholds[:, window_idx, np.newaxis]
+        ).astype(np.int8)
+        ace_values[window_idx] = _amplitude_coalition_entropy_binary(
+            binary_matrix[np.newaxis], window_seeds[window_idx:window_idx + 1]
+        )[0]
+
+    return ace_values
+
+
+def synchrony_coalition_entropy(data, per_channel=False, random_state=None,
+                                n_jobs=1, memory_budget=None,
+                                normalization="random", batch_size=None,
+                                dtype=np.float64, pad=False, workers=None):
     """Compute Synchrony Coalition Entropy (SCE).
 
-    Note: The shuffled result is used as normalization.
+    Note: The entropy of a random binary matrix is used as normalization.
     Metric defined in Schartner et al. 2015.
 
     Parameters
     ----------
-    data : ndarray, shape (n_channels, n_times)
-        Mulidimensional time series matrix.
+    data : ndarray, shape (n_channels, n_times) or PackedBinaryMatrix
+        Mulidimensional time series matrix. If PackedBinaryMatrix, it should
+        be the binary synchrony matrix, with shape
+        (n_channels, n_channels - 1, n_times). If the data has an extra
+        leading axis, i.e. (n_epochs, n_channels, n_times), SCE is computed
+        per epoch. It can also be a MNE Raw or Epochs object, and Epochs
+        (or np.memmap) opened without loading the data are read in chunks
+        of epochs.
     per_channel : bool, optional (default False)
         If True, also returns SCE value per channel.
+    random_state : None | int | instance of Generator, optional
+        Random state used to create the random matrix for normalization. If
+        None (default), the seed is drawn from the global numpy random state.
+        If int, the normalization value is cached in memory, and on disk if
+        a cache directory is set (see mecons.utils.set_cache_dir).
+    n_jobs : int | None, optional (default 1)
+        The number of jobs to run in parallel over epochs. If -1, it is set
+        to the number of CPU cores.
+    memory_budget : int | None, optional (default None)
+        If int, approximate maximum number of bytes (per job) used to
+        compute the synchrony matrix. The synchrony matrix is computed one
+        channel at a time, in blocks of samples reduced to the column codes
+        of the channel, so the full synchrony matrix is never allocated.
+        This takes about twice the time, as each pair of channels is
+        computed for both channels. If None, the synchrony matrix is
+        computed at once (packed).
+    normalization : str, optional (default "random")
+        If 'random', the entropy of a random binary matrix with shape
+        (n_channels - 1, n_times) is used as normalization. If 'analytic',
+        the expected entropy of n_times uniform random binary columns is
+        used instead.
+    batch_size : int | None, optional (default None)
+        Maximum number of epochs loaded and processed at once. If None,
+        np.memmap and MNE Epochs are processed one epoch at a time, and
+        other data all at once (one chunk per job).
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform, which is faster for lengths with large
+        prime factors but changes the values slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
 
     Returns
     -------
-    float
+    float or ndarray, shape (n_epochs,)
         Synchrony coalition entropy value (between 0 and 1).
+    ndarray, shape (n_channels,) or (n_epochs, n_channels)
+        SCE value per channel. Only returned if per_channel is True.
     """
-    if not isinstance(data, np.ndarray):
+    if not (isinstance(data, (np.ndarray, PackedBinaryMatrix))
+            or _is_mne_data(data)):
         raise TypeError("Data matrix should be a ndarray of float values.")
 
-    data = detrending_normalization(data)
-    n_channels, n_values = np.shape(data)
-    data = compute_synchrony_matrix(data)
+    if normalization not in ["random", "analytic"]:
+        raise ValueError(
+            "The parameter normalization should be 'random' or 'analytic'.")
+
+    _check_memory_budget(memory_budget)
+
+    if isinstance(data, PackedBinaryMatrix):
+        is_epoched = data.ndim == 4
+        if not is_epoched:
+            data = data[np.newaxis]
+    else:
+        data, is_epoched = _add_epochs_axis(data)
+    n_epochs, n_channels = _epochs_shape(data)[:2]
+    n_values = _epochs_shape(data)[-1]
+
+    root_seed, epoch_seeds = _get_epoch_seeds(random_state, n_epochs)
+    normalization_value = _sce_normalization_value(
+        n_channels - 1, n_values, random_state=root_seed,
+        cache_seed=_get_cache_seed(random_state), normalization=normalization)
+
+    sce_total, channel_sce_value = _parallel_over_epochs(
+        _synchrony_coalition_entropy_epochs, data, epoch_seeds, n_jobs=n_jobs,
+        batch_size=batch_size, normalization_value=normalization_value,
+        memory_budget=memory_budget, dtype=dtype, pad=pad, workers=workers)
+
+    if not is_epoched:
+        sce_total, channel_sce_value = sce_total[0], channel_sce_value[0]
+
+    if per_channel:
+        return sce_total, channel_sce_value
+    else:
+        return sce_total
+
+
+def _check_memory_budget(memory_budget):
+    """Check the memory budget used to compute SCE in blocks."""
+    if memory_budget is not None and (
+            isinstance(memory_budget, bool)
+            or not isinstance(memory_budget, (int, np.integer))
+            or memory_budget <= 0):
+        raise ValueError("The memory budget should be a positive integer.")
+
+
+def _sce_normalization_value(n_rows, n_values, random_state=None,
+                             cache_seed=None, normalization="random"):
+    """Compute the normalization value of SCE.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows of the binary matrix, i.e. n_channels - 1.
+    n_values : int
+        Number of columns of the binary matrix, i.e. n_times.
+    random_state : None | int | instance of SeedSequence or Generator
+        Seed used to create the random binary matrix.
+    cache_seed : int | None, optional (default None)
+        If int, the value is cached with key (n_rows, n_values, cache_seed).
+        It should identify random_state.
+    normalization : str, optional (default "random")
+        If 'random', the entropy of a random binary matrix is used. If
+        'analytic', its expected value is used.
+
+    Returns
+    -------
+    float
+        Normalization value.
+    """
+    if normalization == "analytic":
+        return _cached_baseline(
+            "sce_analytic", (n_rows, n_values),
+            lambda: _expected_random_entropy(n_rows, n_values))
+
+    def _random_entropy():
+        start_stage = _start_stage()
+        col_map = map_matrix_to_integer(
+            create_random_binary_matrix(
+                n_rows, n_values, random_state=random_state)
+        )
+        random_entropy = compute_entropy(col_map)
+        _end_stage("surrogates", start_stage)
+
+        return random_entropy
+
+    if cache_seed is None:
+        return _random_entropy()
+
+    return _cached_baseline(
+        "sce", (n_rows, n_values, cache_seed), _random_entropy)
+
+
+def _expected_random_entropy(n_rows, n_values):
+    """Compute the expected entropy of uniform random binary columns.
+
+    Each of the n_values columns takes one of K = 2**n_rows values with
+    probability p = 1 / K, so each count is binomial B(n_values, p) and
+    E[H] = log2(n) - K * sum_c(P(count = c) * c * log2(c)) / n.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows of the binary matrix.
+    n_values : int
+        Number of columns of the binary matrix.
+
+    Returns
+    -------
+    float
+        Expected entropy value.
+    """
+    counts = np.arange(2, n_values + 1)
+    # log(K * P(count = c)), computed in log space to avoid underflow
+    log_p = -n_rows * np.log(2)
+    log_1mp = np.log1p(-np.exp(log_p))
+    log_k_pmf = (
+        n_rows * np.log(2)
+        + gammaln(n_values + 1) - gammaln(counts + 1)
+        - gammaln(n_values - counts + 1)
+        + counts * log_p + (n_values - counts) * log_1mp
+    )
+    c_log_c = np.sum(np.exp(log_k_pmf) * counts * np.log2(counts))
+
+    return np.log2(n_values) - c_log_c / n_values
+
+
+def _synchrony_coalition_entropy_epochs(data, epoch_seeds,
+                                        normalization_value,
+                                        memory_budget=None,
+                                        dtype=np.float64, pad=False,
+                                        workers=None):
+    """Preprocess the data and compute SCE per epoch."""
+    if isinstance(data, np.ndarray):
+        data = detrending_normalization(data, dtype=dtype)
+        if memory_budget is not None:
+            return _synchrony_coalition_entropy_blocks(
+                _analytic_signal(data, pad=pad, workers=workers),
+                normalization_value, memory_budget)
+
+        # the synchrony matrix is kept packed to reduce memory 8x
+        data = compute_synchrony_matrix(
+            data, packed=True, dtype=None, pad=pad, workers=workers)
+
+    return _synchrony_coalition_entropy_binary(data, normalization_value)
+
+
+def _synchrony_coalition_entropy_blocks(analytic_signal, normalization_value,
+                                        memory_budget, threshold=0.8):
+    """Compute SCE from the analytic signal in blocks of samples.
+
+    The channels are processed one at a time. The synchrony of the channel
+    with the other channels is computed in blocks of samples and each block
+    is reduced to column codes, so only the column codes of one channel are
+    kept for the whole recording. The column codes (and their sorted copy to
+    count them) are part of the memory budget, the rest of the budget sets
+    the block size. Each pair of channels is computed twice, once for each
+    channel.
+
+    Parameters
+    ----------
+    analytic_signal : ndarray, shape (n_epochs, n_channels, n_times)
+        Analytic signal of the time series.
+    normalization_value : float
+        Entropy of a random binary matrix used as normalization.
+    memory_budget : int
+        Approximate maximum number of bytes used at once.
+    threshold : float, optional (default 0.8)
+        Threshold to define "synchronized" (1) and "not synchronized" (0).
+
+    Returns
+    -------
+    ndarray, shape (n_epochs,)
+        Synchrony coalition entropy value (between 0 and 1).
+    ndarray, shape (n_epochs, n_channels)
+        SCE value per channel.
+    """
+    n_epochs, n_channels, n_times = analytic_signal.shape
+    n_rows = max(n_channels - 1, 1)
+    # bytes per column code, see map_matrix_to_integer
+    code_bytes = 8 if n_rows <= 64 else -(-n_rows // 8)
+    col_map_bytes = 2 * code_bytes * n_epochs * n_times
+    block_size = max(
+        1,
+        (memory_budget - col_map_bytes)
+        // (_SYNCHRONY_BYTES_PER_VALUE * n_epochs * n_rows)
+    )
+
+    channel_sce_value = np.zeros((n_epochs, n_channels))
+    for ch_idx in range(n_channels):
+        # column codes of the channel for the whole recording
+        col_map = None
+        for start in range(0, n_times, block_size):
+            block = slice(start, start + block_size)
+            block_col_map = map_matrix_to_integer(
+                _channel_synchrony_from_analytic(
+                    analytic_signal[..., block], ch_idx,
+                    threshold=threshold))
+            if col_map is None:
+                col_map = np.empty(
+                    (n_epochs, n_times), dtype=block_col_map.dtype)
+            col_map[:, block] = block_col_map
+
+        # compute sce value (not normalized)
+        channel_sce_value[:, ch_idx] = compute_entropy(col_map)
+
+    # normalize
+    sce_total = np.mean(channel_sce_value, axis=-1) / normalization_value
+
+    return sce_total, channel_sce_value / normalization_value
+
+
+def _synchrony_coalition_entropy_binary(data, normalization_value):
+    """Compute SCE from the binary synchrony matrix.
+
+    Parameters
+    ----------
+    data : ndarray or PackedBinaryMatrix
+        Binary synchrony matrix, with shape
+        (n_epochs, n_channels, n_channels - 1, n_times).
+    normalization_value : float
+        Entropy of a random binary matrix used as normalization.
+
+    Returns
+    -------
+    ndarray, shape (n_epochs,)
+        Synchrony coalition entropy value (between 0 and 1).
+    ndarray, shape (n_epochs, n_channels)
+        SCE value per channel.
+    """
+    n_epochs, n_channels, _, n_values = data.shape
 
     # compute sce value (not normalized)
-    channel_sce_value = np.zeros(n_channels)
+    col_map = list()
     for ch_idx in range(n_channels):
         try:
-            col_map = map_matrix_to_integer(data[ch_idx])
+            col_map.append(map_matrix_to_integer(data[:, ch_idx]))
         except ValueError as ex:
             raise ex
-        channel_sce_value[ch_idx] = compute_entropy(col_map)
-
-    # create random matrix for normalization
-    col_map = map_matrix_to_integer(
-        create_random_binary_matrix(n_channels - 1, n_values)
-    )
-    normalization_value = compute_entropy(col_map)
+    col_map = np.stack(col_map, axis=1)
+    channel_sce_value = compute_entropy(
+        col_map.reshape(n_epochs * n_channels, n_values)
+    ).reshape(n_epochs, n_channels)
 
     # normalize
-    sce_total = np.mean(channel_sce_value) / normalization_value
+    sce_total = np.mean(channel_sce_value, axis=-1) / normalization_value
 
-    if per_channel:
-        return sce_total, channel_sce_value/normalization_value
-    else:
-        return sce_total
+    return sce_total, channel_sce_value / normalization_value
@@ -0,0 +1,163 @@
+"""Compute complexity metrics on MNE Epochs and Raw objects."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+from ..utils.chunks import _EpochsReader, _is_mne_data, _is_mne_epochs
+from .metrics import METRICS, compute_metrics
+
+
+def compute_epochs_metrics(inst, metrics=METRICS, picks="data", tmin=None,
+                           tmax=None, event_id=None, events=None,
+                           output="array", **kwargs):
+    """Compute complexity metrics per epoch of MNE Epochs or Raw.
+
+    The data is read through get_data in chunks of epochs, so Epochs and Raw
+    opened with preload=False are never fully loaded. The metrics are
+    computed with compute_metrics, in parallel over epochs if n_jobs is
+    given.
+
+    Parameters
+    ----------
+    inst : instance of Epochs or Raw
+        MNE object with the data. If Raw and events is None, the whole
+        recording (between tmin and tmax) is used as one epoch.
+    metrics : list of str, optional (default ("lzc", "ace", "sce"))
+        Metrics to compute. Valid metrics are 'lzc', 'ace' and 'sce'.
+    picks : str | list | None, optional (default "data")
+        Channels to use, in any format accepted by MNE (channel types,
+        names or indices). If None, all channels.
+    tmin : float | None, optional (default None)
+        Start time of the data used, relative to each epoch (Epochs or Raw
+        with events) or to the start of the recording (Raw). If None, the
+        start of the epochs, or -0.2 s from each event for Raw with events.
+    tmax : float | None, optional (default None)
+        End time of the data used, same as tmin. If None, the end of the
+        epochs, or 0.5 s from each event for Raw with events.
+    event_id : str | list of str | dict | None, optional (default None)
+        Events to select. For Epochs, condition names, e.g. 'auditory' or
+        ['auditory', 'visual']. For Raw, a dict mapping condition names to
+        event codes, passed to mne.Epochs. If None, all events.
+    events : ndarray of int, shape (n_events, 3) | None, optional
+        Events used to epoch a Raw object (see mne.find_events). Ignored for
+        Epochs.
+    output : str, optional (default "array")
+        If 'array', returns a structured array. If 'dataframe', returns a
+        pandas DataFrame indexed by epoch and event (requires pandas).
+    **kwargs : dict
+        Extra keyword arguments passed to compute_metrics, e.g.
+        random_state, n_jobs, batch_size or per_channel.
+
+    Returns
+    -------
+    ndarray or DataFrame, shape (n_epochs,)
+        One record per epoch with the fields 'epoch' (index of the epoch in
+        the original events), 'event' (event code), 'condition' (event
+        name) and one field per metric. If per_channel is True, SCE value
+        per channel is in the field 'sce_per_channel' (array) or in one
+        column 'sce_<channel name>' per channel (DataFrame).
+    """
+    if not _is_mne_data(inst):
+        raise TypeError("The input should be a MNE Epochs or Raw object.")
+
+    if output not in ["array", "dataframe"]:
+        raise ValueError("The parameter output should be 'array' or "
+                         "'dataframe'.")
+
+    if _is_mne_epochs(inst) or events is not None:
+        epochs = _select_epochs(inst, picks, tmin, tmax, event_id, events)
+        event_codes = epochs.events[:, 2]
+        epoch_idx = epochs.epochs.selection
+        names = {code: name for name, code in epochs.epochs.event_id.items()}
+        conditions = [names.get(code, "") for code in event_codes]
+        ch_names = epochs.ch_names
+    else:
+        # the whole recording is one epoch
+        picks = _picks_to_idx(inst.info, picks)
+        epochs = inst.get_data(picks=picks, tmin=tmin, tmax=tmax)[np.newaxis]
+        event_codes, epoch_idx, conditions = [0], [0], [""]
+        ch_names = [inst.ch_names[pick] for pick in picks]
+
+    results = compute_metrics(epochs, metrics=metrics, **kwargs)
+
+    if output == "dataframe":
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for output='dataframe'.")
+
+        columns = dict(epoch=epoch_idx, event=event_codes,
+                       condition=conditions)
+        for metric, values in results.items():
+            if metric == "sce_per_channel":
+                for ch_name, ch_values in zip(ch_names, np.asarray(values).T):
+                    columns["sce_" + ch_name] = ch_values
+            else:
+                columns[metric] = values
+
+        return pd.DataFrame(columns).set_index(["epoch", "event"])
+
+    dtype = [("epoch", np.int64), ("event", np.int64),
+             ("condition", "U%d" % max(max(map(len, conditions)), 1))]
+    for metric in results:
+        if metric == "sce_per_channel":
+            dtype.append((metric, np.float64, (len(ch_names),)))
+        else:
+            dtype.append((metric, np.float64))
+
+    records = np.zeros(len(event_codes), dtype=dtype)
+    records["epoch"] = epoch_idx
+    records["event"] = event_codes
+    records["condition"] = conditions
+    for metric, values in results.items():
+        records[metric] = values
+
+    return records
+
+
+def _select_epochs(inst, picks, tmin, tmax, event_id, events):
+    """Select the epochs, channels and times to read from an MNE object.
+
+    Returns
+    -------
+    instance of _EpochsReader
+        Epochs reading the selection one chunk at a time.
+    """
+    if _is_mne_epochs(inst):
+        if event_id is not None:
+            inst = inst[event_id]
+    else:
+        import mne
+
+        kwargs = dict()
+        if tmin is not None:
+            kwargs["tmin"] = tmin
+        if tmax is not None:
+            kwargs["tmax"] = tmax
+        inst = mne.Epochs(inst, events, event_id=event_id, baseline=None,
+                          preload=False, verbose=False, **kwargs)
+        tmin, tmax = None, None
+
+    return _EpochsReader(inst, picks=_picks_to_idx(inst.info, picks),
+                         tmin=tmin, tmax=tmax)
+
+
+def _picks_to_idx(info, picks):
+    """Return the indices of the channels given by picks.
+
+    The picks are applied with the pick method of a one-sample Raw object
+    with the same info, so any format accepted by MNE can be used without
+    loading the data.
+    """
+    import mne
+
+    ch_names = info["ch_names"]
+    if picks is None:
+        return list(range(len(ch_names)))
+
+    raw = mne.io.RawArray(np.zeros((len(ch_names), 1)), info, verbose=False)
+    picked_names = raw.pick(picks).ch_names
+
+    return [ch_names.index(ch_name) for ch_name in picked_names]
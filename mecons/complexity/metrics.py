@@ -0,0 +1,181 @@
+"""Compute several complexity metrics sharing the preprocessing stages."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+from ..utils.preprocessing import (
+    detrending_normalization,
+    _add_epochs_axis,
+    _analytic_signal
+)
+from ..utils.binary import _binarize_amplitude, _synchrony_from_analytic
+from ..utils.parallel import _get_epoch_seeds, _parallel_over_epochs
+from ..utils.chunks import _epochs_shape, _is_mne_data
+from ..utils.baseline import _check_n_surrogates, _get_cache_seed
+from .compressibility import _lempel_ziv_complexity_binary
+from .entropy import (
+    _amplitude_coalition_entropy_binary,
+    _check_memory_budget,
+    _sce_normalization_value,
+    _synchrony_coalition_entropy_binary,
+    _synchrony_coalition_entropy_blocks
+)
+
+METRICS = ("lzc", "ace", "sce")
+
+
+def compute_metrics(data, metrics=METRICS, thr_method="mean",
+                    sync_threshold=0.8, per_channel=False, random_state=None,
+                    n_jobs=1, memory_budget=None, n_surrogates=1,
+                    batch_size=None, dtype=np.float64, pad=False,
+                    workers=None):
+    """Compute several complexity metrics on the same data.
+
+    The data is detrended and Hilbert-transformed only once. The amplitude
+    of the analytic signal is used for LZc and ACE, and its phase for SCE
+    (through the products of the analytic signals).
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_channels, n_times)
+        Mulidimensional time series matrix. If 3D, with shape
+        (n_epochs, n_channels, n_times), the metrics are computed per epoch.
+        It can also be a MNE Raw or Epochs object, and Epochs (or np.memmap)
+        opened without loading the data are read in chunks of epochs.
+    metrics : list of str, optional (default ("lzc", "ace", "sce"))
+        Metrics to compute. Valid metrics are 'lzc', 'ace' and 'sce'.
+    thr_method : str, optional (default "mean")
+        Threshold method used to binarize the Hilbert amplitude (LZc, ACE).
+        See binarize_hilbert_amplitude.
+    sync_threshold : float, optional (default 0.8)
+        Threshold to define "synchronized" (1) and "not synchronized" (0)
+        channels (SCE).
+    per_channel : bool, optional (default False)
+        If True, also returns SCE value per channel as 'sce_per_channel'.
+    random_state : None | int | instance of Generator, optional
+        Random state used for the normalization of the metrics. With the
+        same random_state, the values are the same as computing each metric
+        separately. If None (default), the seed is drawn from the global
+        numpy random state.
+    n_jobs : int | None, optional (default 1)
+        The number of jobs to run in parallel over epochs. If -1, it is set
+        to the number of CPU cores.
+    memory_budget : int | None, optional (default None)
+        If int, approximate maximum number of bytes (per job) used to
+        compute the synchrony matrix of SCE in blocks of samples. See
+        synchrony_coalition_entropy.
+    n_surrogates : int, optional (default 1)
+        Number of shuffled matrices used for the normalization of LZc and
+        ACE.
+    batch_size : int | None, optional (default None)
+        Maximum number of epochs loaded and processed at once. If None,
+        np.memmap and MNE Epochs are processed one epoch at a time, and
+        other data all at once (one chunk per job).
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform, which is faster for lengths with large
+        prime factors but changes the values slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
+
+    Returns
+    -------
+    dict
+        Value of each metric, keyed by metric name. If the data has epochs,
+        the values are arrays of shape (n_epochs,).
+    """
+    if not (isinstance(data, np.ndarray) or _is_mne_data(data)):
+        raise TypeError("Data matrix should be a ndarray of float values.")
+
+    if isinstance(metrics, str):
+        metrics = [metrics]
+
+    for metric in metrics:
+        if metric not in METRICS:
+            raise ValueError(
+                "Unknown metric '%s'. Valid metrics are %s."
+                % (metric, ", ".join(METRICS)))
+
+    if thr_method not in ["mean", "median"]:
+        raise ValueError(
+            "The parameter thr_method should be 'mean' or 'median'.")
+
+    _check_n_surrogates(n_surrogates)
+    _check_memory_budget(memory_budget)
+
+    data, is_epoched = _add_epochs_axis(data)
+    n_epochs, n_channels, n_values = _epochs_shape(data)
+    root_seed, epoch_seeds = _get_epoch_seeds(random_state, n_epochs)
+
+    keys = [metric for metric in METRICS if metric in metrics]
+    normalization_value = None
+    if "sce" in metrics:
+        normalization_value = _sce_normalization_value(
+            n_channels - 1, n_values, random_state=root_seed,
+            cache_seed=_get_cache_seed(random_state))
+        if per_channel:
+            keys.append("sce_per_channel")
+
+    values = _parallel_over_epochs(
+        _compute_metrics_epochs, data, epoch_seeds, n_jobs=n_jobs,
+        batch_size=batch_size,
+        metrics=metrics, thr_method=thr_method, sync_threshold=sync_threshold,
+        per_channel=per_channel, normalization_value=normalization_value,
+        memory_budget=memory_budget, n_surrogates=n_surrogates, dtype=dtype,
+        pad=pad, workers=workers)
+
+    results = dict(zip(keys, values))
+    if not is_epoched:
+        results = {metric: value[0] for metric, value in results.items()}
+
+    return results
+
+
+def _compute_metrics_epochs(data, epoch_seeds, metrics, thr_method,
+                            sync_threshold, per_channel, normalization_value,
+                            memory_budget, n_surrogates, dtype, pad,
+                            workers):
+    """Compute the metrics per epoch sharing the preprocessing stages.
+
+    Returns a tuple with the values of 'lzc', 'ace', 'sce' and
+    'sce_per_channel', keeping only the requested metrics.
+    """
+    # shared stages: detrending and analytic signal
+    data = detrending_normalization(data, dtype=dtype)
+    analytic_signal = _analytic_signal(data, pad=pad, workers=workers)
+
+    values = list()
+    if "lzc" in metrics or "ace" in metrics:
+        binary_matrix = _binarize_amplitude(
+            np.abs(analytic_signal), thr_method=thr_method)
+
+        if "lzc" in metrics:
+            values.append(_lempel_ziv_complexity_binary(
+                binary_matrix, epoch_seeds, n_surrogates=n_surrogates))
+
+        if "ace" in metrics:
+            values.append(_amplitude_coalition_entropy_binary(
+                binary_matrix, epoch_seeds, n_surrogates=n_surrogates))
+
+    if "sce" in metrics:
+        if memory_budget is None:
+            synch_matrix = _synchrony_from_analytic(
+                analytic_signal, threshold=sync_threshold, packed=True)
+            sce_total, sce_per_channel = _synchrony_coalition_entropy_binary(
+                synch_matrix, normalization_value)
+        else:
+            sce_total, sce_per_channel = _synchrony_coalition_entropy_blocks(
+                analytic_signal, normalization_value, memory_budget,
+                threshold=sync_threshold)
+        values.append(sce_total)
+        if per_channel:
+            values.append(sce_per_channel)
+
+    return tuple(values)
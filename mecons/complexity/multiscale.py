@@ -0,0 +1,257 @@
+"""Compute complexity metrics over several temporal scales."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+from ..utils.preprocessing import (
+    detrending_normalization,
+    _add_epochs_axis,
+    _analytic_signal
+)
+from ..utils.binary import _binarize_amplitude
+from ..utils.parallel import _get_epoch_seeds, _parallel_over_epochs
+from ..utils.chunks import _epochs_shape, _is_mne_data
+from ..utils.profiling import _start_stage, _end_stage
+from ..utils.baseline import _check_n_surrogates
+from .compressibility import _check_lz_method, _lempel_ziv_complexity_binary
+from .entropy import _amplitude_coalition_entropy_binary
+
+MULTISCALE_METRICS = ("lzc", "ace")
+
+
+def compute_multiscale_metrics(data, scales=5, metrics=MULTISCALE_METRICS,
+                               coarse_graining="mean", thr_method="mean",
+                               random_state=None, n_jobs=1, n_surrogates=1,
+                               batch_size=None, dtype=np.float64, pad=False,
+                               workers=None, method="lzw"):
+    """Compute LZc and ACE over several temporal scales.
+
+    The data is detrended and Hilbert-transformed only once. For each scale
+    s, the amplitude of the analytic signal is coarse-grained by a factor s,
+    and then binarized (all epochs at once) and compressed. At scale 1, the
+    values are the same as computing each metric separately.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_channels, n_times)
+        Mulidimensional time series matrix. If 3D, with shape
+        (n_epochs, n_channels, n_times), the metrics are computed per epoch.
+        It can also be a MNE Raw or Epochs object, and Epochs (or np.memmap)
+        opened without loading the data are read in chunks of epochs.
+    scales : int | list of int, optional (default 5)
+        Coarse-graining factors. If int, the scales 1 to scales. The
+        coarse-grained time series should have at least 2 samples.
+    metrics : list of str, optional (default ("lzc", "ace"))
+        Metrics to compute. Valid metrics are 'lzc' and 'ace'.
+    coarse_graining : str, optional (default "mean")
+        If 'mean', the amplitude is averaged over consecutive
+        non-overlapping windows of s samples (the last incomplete window is
+        dropped). If 'decimate', one sample every s samples is kept.
+    thr_method : str, optional (default "mean")
+        Threshold method used to binarize the coarse-grained amplitude. See
+        binarize_hilbert_amplitude.
+    random_state : None | int | instance of Generator, optional
+        Random state used for the normalization of the metrics. Each epoch
+        and scale gets its own seed derived from it. If None (default), the
+        seed is drawn from the global numpy random state.
+    n_jobs : int | None, optional (default 1)
+        The number of jobs to run in parallel over epochs. If -1, it is set
+        to the number of CPU cores.
+    n_surrogates : int, optional (default 1)
+        Number of shuffled matrices used for the normalization of LZc and
+        ACE.
+    batch_size : int | None, optional (default None)
+        Maximum number of epochs loaded and processed at once. If None,
+        np.memmap and MNE Epochs are processed one epoch at a time, and
+        other data all at once (one chunk per job).
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the detrending and the Hilbert transform, np.float64 or
+        np.float32 (halves the memory). If None, the precision of the input
+        is kept.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform. See compute_metrics.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
+    method : str, optional (default "lzw")
+        Compression of the binary sequences of LZc, 'lzw' or 'lz76' (see
+        lempel_ziv_complexity).
+
+    Returns
+    -------
+    dict
+        Profile of each metric over the scales, keyed by metric name, with
+        shape (n_scales,). If the data has epochs, the profiles have shape
+        (n_epochs, n_scales).
+    """
+    if not (isinstance(data, np.ndarray) or _is_mne_data(data)):
+        raise TypeError("Data matrix should be a ndarray of float values.")
+
+    if isinstance(metrics, str):
+        metrics = [metrics]
+
+    for metric in metrics:
+        if metric not in MULTISCALE_METRICS:
+            raise ValueError(
+                "Unknown metric '%s'. Valid metrics are %s."
+                % (metric, ", ".join(MULTISCALE_METRICS)))
+
+    if coarse_graining not in ["mean", "decimate"]:
+        raise ValueError(
+            "The parameter coarse_graining should be 'mean' or 'decimate'.")
+
+    if thr_method not in ["mean", "median"]:
+        raise ValueError(
+            "The parameter thr_method should be 'mean' or 'median'.")
+
+    _check_n_surrogates(n_surrogates)
+    _check_lz_method(method)
+
+    data, is_epoched = _add_epochs_axis(data)
+    n_epochs, _, n_values = _epochs_shape(data)
+    scales = _check_scales(scales, n_values, coarse_graining)
+    _, epoch_seeds = _get_epoch_seeds(random_state, n_epochs)
+
+    keys = [metric for metric in MULTISCALE_METRICS if metric in metrics]
+    values = _parallel_over_epochs(
+        _compute_multiscale_metrics_epochs, data, epoch_seeds, n_jobs=n_jobs,
+        batch_size=batch_size,
+        scales=scales, metrics=metrics, coarse_graining=coarse_graining,
+        thr_method=thr_method, n_surrogates=n_surrogates, dtype=dtype,
+        pad=pad, workers=workers, method=method)
+
+    results = dict(zip(keys, values))
+    if not is_epoched:
+        results = {metric: value[0] for metric, value in results.items()}
+
+    return results
+
+
+def _compute_multiscale_metrics_epochs(data, epoch_seeds, scales, metrics,
+                                       coarse_graining, thr_method,
+                                       n_surrogates, dtype, pad, workers,
+                                       method):
+    """Compute the metrics per epoch and scale from one analytic signal.
+
+    Returns a tuple with the profiles of 'lzc' and 'ace', with shape
+    (n_epochs, n_scales), keeping only the requested metrics.
+    """
+    # shared stages: detrending and Hilbert amplitude
+    data = detrending_normalization(data, dtype=dtype)
+    hilbert_amplitude_matrix = np.abs(
+        _analytic_signal(data, pad=pad, workers=workers))
+
+    n_epochs = len(epoch_seeds)
+    lzc_values = np.zeros((n_epochs, len(scales)))
+    ace_values = np.zeros((n_epochs, len(scales)))
+    for scale_idx, scale in enumerate(scales):
+        binary_matrix = _binarize_amplitude(
+            _coarse_grain(hilbert_amplitude_matrix, scale, coarse_graining),
+            thr_method=thr_method)
+        scale_seeds = _get_scale_seeds(epoch_seeds, scale)
+
+        if "lzc" in metrics:
+            lzc_values[:, scale_idx] = _lempel_ziv_complexity_binary(
+                binary_matrix, scale_seeds, n_surrogates=n_surrogates,
+                method=method)
+
+        if "ace" in metrics:
+            ace_values[:, scale_idx] = _amplitude_coalition_entropy_binary(
+                binary_matrix, scale_seeds, n_surrogates=n_surrogates)
+
+    values = list()
+    if "lzc" in metrics:
+        values.append(lzc_values)
+    if "ace" in metrics:
+        values.append(ace_values)
+
+    return tuple(values)
+
+
+def _coarse_grain(hilbert_amplitude_matrix, scale, coarse_graining="mean"):
+    """Coarse-grain the time series by a factor.
+
+    Parameters
+    ----------
+    hilbert_amplitude_matrix : ndarray, shape (..., n_times)
+        Instantaneous amplitude of the analytic signal.
+    scale : int
+        Coarse-graining factor.
+    coarse_graining : str, optional (default "mean")
+        If 'mean', the mean of consecutive non-overlapping windows of scale
+        samples. If 'decimate', one sample every scale samples.
+
+    Returns
+    -------
+    ndarray, shape (..., n_times // scale) or (..., ceil(n_times / scale))
+        Coarse-grained time series (the same array if scale is 1).
+    """
+    if scale == 1:
+        return hilbert_amplitude_matrix
+
+    start_stage = _start_stage()
+    if coarse_graining == "decimate":
+        coarse_matrix = hilbert_amplitude_matrix[..., ::scale]
+    else:
+        n_windows = hilbert_amplitude_matrix.shape[-1] // scale
+        coarse_matrix = hilbert_amplitude_matrix[..., :n_windows * scale]
+        coarse_matrix = coarse_matrix.reshape(
+            coarse_matrix.shape[:-1] + (n_windows, scale)).mean(axis=-1)
+    _end_stage("coarse_graining", start_stage, coarse_matrix)
+
+    return coarse_matrix
+
+
+def _get_scale_seeds(epoch_seeds, scale):
+    """Return the seed per epoch used at a scale.
+
+    The epoch seeds are used at scale 1, so the values are the same as
+    computing each metric separately. Other scales use independent seeds
+    derived from the epoch seeds, which don't depend on the other scales.
+    """
+    if scale == 1:
+        return epoch_seeds
+
+    return [np.random.SeedSequence(epoch_seed.entropy,
+                                   spawn_key=epoch_seed.spawn_key + (scale,))
+            for epoch_seed in epoch_seeds]
+
+
+def _check_scales(scales, n_values, coarse_graining="mean"):
+    """Check the coarse-graining factors and return them as a list.
+
+    Each coarse-grained time series should keep at least 2 samples, so the
+    binarized matrices have more than one column.
+    """
+    if isinstance(scales, (int, np.integer)) and not isinstance(scales, bool):
+        scales = list(range(1, scales + 1))
+
+    if (not isinstance(scales, (list, tuple, np.ndarray))
+            or not all(isinstance(scale, (int, np.integer))
+                       and not isinstance(scale, bool)
+                       for scale in scales)):
+        raise TypeError(
+            "The parameter scales should be an integer or a list of "
+            "integers.")
+
+    if len(scales) == 0 or min(scales) < 1:
+        raise ValueError("The scales should be positive.")
+
+    n_coarse_values = _n_coarse_values(n_values, max(scales), coarse_graining)
+    if n_coarse_values < 2:
+        raise ValueError(
+            "The coarse-grained time series should have at least 2 samples, "
+            "the maximum scale is too large for %d samples." % n_values)
+
+    return [int(scale) for scale in scales]
+
+
+def _n_coarse_values(n_values, scale, coarse_graining="mean"):
+    """Return the number of samples of a coarse-grained time series."""
+    if coarse_graining == "decimate":
+        return -(-n_values // scale)
+
+    return n_values // scale
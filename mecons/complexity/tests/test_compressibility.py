@@ -4,14 +4,20 @@
 # Date: 09.2022
 # License : BSD-3-Clause
 
+import os
+
 import numpy as np
 from numpy.random import default_rng
 import pytest
 
 from mecons.complexity.compressibility import (
     _lempel_ziv_welch_compression,
-    lempel_ziv_complexity
+    _lempel_ziv_welch_trie,
+    _lempel_ziv_76,
+    lempel_ziv_complexity,
+    windowed_lempel_ziv_complexity
 )
+from mecons.utils import set_cache_dir
 
 
 def test_lempel_ziv_welch_compression():
@@ -29,6 +35,79 @@ def test_lempel_ziv_welch_compression():
     assert exc_info.type == TypeError
 
 
+def test_lempel_ziv_welch_trie():
+    """Test Lempel-Ziv-Welch compression with the trie engine."""
+    # testing correct operation
+    binary_buffer = np.array([0, 1, 0, 1], dtype=np.uint8)
+    dict_len = _lempel_ziv_welch_trie(binary_buffer)
+
+    assert dict_len == 3
+
+    # same dictionary size as the string implementation
+    rgn = default_rng(0)
+    for p in [0.1, 0.5, 0.9]:
+        binary_buffer = (rgn.random(1000) < p).astype(np.uint8)
+        binary_str = "".join(str(c) for c in binary_buffer)
+        assert _lempel_ziv_welch_trie(binary_buffer) == \
+            _lempel_ziv_welch_compression(binary_str)
+        assert _lempel_ziv_welch_trie(binary_buffer.tobytes()) == \
+            _lempel_ziv_welch_compression(binary_str)
+
+    # testeting argument checker
+    with pytest.raises(TypeError) as exc_info:
+        dict_len = _lempel_ziv_welch_trie("0101")
+    assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        dict_len = _lempel_ziv_welch_trie(np.array([0, 2, 1], dtype=np.uint8))
+    assert exc_info.type == ValueError
+
+
+def _lempel_ziv_76_naive(binary_str):
+    """Count the LZ76 phrases searching the copies in the prefix."""
+    n_phrases, start = 0, 0
+    while start < len(binary_str):
+        length = 1
+        while (start + length <= len(binary_str) and
+               binary_str[start:start + length]
+               in binary_str[:start + length - 1]):
+            length += 1
+        n_phrases += 1
+        start += length
+
+    return n_phrases
+
+
+def test_lempel_ziv_76():
+    """Test LZ76 parsing with the suffix automaton."""
+    # testing correct operation
+    # 0 | 001 | 10 | 100 | 1000 | 101 (Kaspar and Schuster 1987)
+    binary_str = "0001101001000101"
+    binary_buffer = np.array([int(c) for c in binary_str], dtype=np.uint8)
+
+    assert _lempel_ziv_76(binary_buffer) == 6
+    assert _lempel_ziv_76(np.zeros(0, dtype=np.uint8)) == 0
+
+    # same number of phrases as the quadratic search
+    rgn = default_rng(0)
+    for p in [0.1, 0.5, 0.9]:
+        binary_buffer = (rgn.random(500) < p).astype(np.uint8)
+        binary_str = "".join(str(c) for c in binary_buffer)
+        assert _lempel_ziv_76(binary_buffer) == \
+            _lempel_ziv_76_naive(binary_str)
+        assert _lempel_ziv_76(binary_buffer.tobytes()) == \
+            _lempel_ziv_76_naive(binary_str)
+
+    # testeting argument checker
+    with pytest.raises(TypeError) as exc_info:
+        _lempel_ziv_76("0101")
+    assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        _lempel_ziv_76(np.array([0, 2, 1], dtype=np.uint8))
+    assert exc_info.type == ValueError
+
+
 def test_lempel_ziv_complexity():
     """Test computation of Lempel Ziv complexity metric."""
     # testing correct operation
@@ -56,3 +135,98 @@ def test_lempel_ziv_complexity():
     with pytest.raises(TypeError) as exc_info:
         lzc = lempel_ziv_complexity(data)
     assert exc_info.type == TypeError
+
+
+def test_lempel_ziv_complexity_epochs(tmp_path):
+    """Test computation of Lempel Ziv complexity over epochs."""
+    rgn = default_rng(0)
+    data = rgn.standard_normal((3, 4, 100)).cumsum(axis=-1)
+
+    # one value per epoch, with the same seed for the first epoch
+    lzc_values = lempel_ziv_complexity(data, random_state=0)
+
+    assert lzc_values.shape == (3,)
+    assert lzc_values[0] == lempel_ziv_complexity(data[0], random_state=0)
+
+    # same values running in parallel
+    parallel_lzc_values = lempel_ziv_complexity(data, random_state=0, n_jobs=2)
+    np.testing.assert_array_equal(lzc_values, parallel_lzc_values)
+
+    # the normalization is shuffled per epoch and never cached
+    set_cache_dir(str(tmp_path))
+    try:
+        np.testing.assert_array_equal(
+            lzc_values, lempel_ziv_complexity(data, random_state=0))
+    finally:
+        set_cache_dir(None)
+    assert os.listdir(str(tmp_path)) == []
+
+    # several surrogates
+    lzc_values, surrogate_mean, surrogate_std = lempel_ziv_complexity(
+        data, random_state=0, n_surrogates=10, return_surrogates=True)
+    assert lzc_values.shape == surrogate_mean.shape == (3,)
+    assert np.all(surrogate_std > 0)
+
+    # LZ76 parsing, with the same normalization
+    lz76_values, surrogate_mean, _ = lempel_ziv_complexity(
+        data, random_state=0, n_surrogates=10, return_surrogates=True,
+        method="lz76")
+    assert lz76_values.shape == (3,)
+    assert np.all((lz76_values > 0) & (lz76_values < 1.5))
+    assert not np.array_equal(lz76_values, lzc_values)
+    np.testing.assert_array_equal(
+        lz76_values, lempel_ziv_complexity(
+            data, random_state=0, n_surrogates=10, method="lz76"))
+
+    # testing argument checker
+    with pytest.raises(ValueError) as exc_info:
+        lzc = lempel_ziv_complexity(data, n_surrogates=0)
+    assert exc_info.type == ValueError
+
+    with pytest.raises(ValueError) as exc_info:
+        lzc = lempel_ziv_complexity(data, method="lz78")
+    assert exc_info.type == ValueError
+
+
+def test_windowed_lempel_ziv_complexity():
+    """Test computation of Lempel Ziv complexity over sliding windows."""
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((4, 1000)).cumsum(axis=-1)
+    lzc_values = windowed_lempel_ziv_complexity(data, 200, 100)
+
+    assert lzc_values.shape == (9,)
+
+    # every window of noise is more complex than any window of sines
+    times = np.arange(1000) / 100
+    sines = np.sin(2 * np.pi * np.arange(1, 5)[:, np.newaxis] * times)
+    noise = rgn.standard_normal((4, 1000))
+    sine_values = windowed_lempel_ziv_complexity(
+        sines, 200, 100, random_state=0)
+    noise_values = windowed_lempel_ziv_complexity(
+        noise, 200, 100, random_state=0)
+    assert np.all(sine_values > 0)
+    assert noise_values.min() > sine_values.max()
+
+    # one window over the whole recording is the usual LZc
+    lzc_values = windowed_lempel_ziv_complexity(
+        data, 1000, 1, random_state=0)
+    np.testing.assert_array_equal(
+        lzc_values, [lempel_ziv_complexity(data, random_state=0)])
+
+    # single precision, close to double precision
+    lzc_values = windowed_lempel_ziv_complexity(
+        data, 200, 100, random_state=0)
+    np.testing.assert_allclose(
+        windowed_lempel_ziv_complexity(
+            data, 200, 100, random_state=0, dtype=np.float32),
+        lzc_values, atol=0.02)
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        lzc_values = windowed_lempel_ziv_complexity([[]], 200, 100)
+    assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        lzc_values = windowed_lempel_ziv_complexity(data, 2000, 100)
+    assert exc_info.type == ValueError
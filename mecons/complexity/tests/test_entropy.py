@@ -4,6 +4,8 @@
 # Date: 09.2022
 # License : BSD-3-Clause
 
+import warnings
+
 import numpy as np
 from numpy.random import default_rng
 import pytest
@@ -11,7 +13,12 @@ import pytest
 from mecons.complexity.entropy import (
     amplitude_coalition_entropy,
     synchrony_coalition_entropy,
-    _compute_entropy
+    windowed_amplitude_coalition_entropy,
+    compute_entropy,
+    _windowed_entropy,
+    _expected_random_entropy,
+    _sce_normalization_value,
+    _amplitude_coalition_entropy_binary
 )
 
 
@@ -20,16 +27,175 @@ def test_compute_entropy_string():
     # test correct operation
     col_map = [1, 5, 5, 1, 1, 5]
     # binary_str = str(col_map)
-    entropy_value = _compute_entropy(col_map)
+    entropy_value = compute_entropy(col_map)
 
     assert entropy_value == 1
 
     binary_string_list = np.array(["1", "0", "1", "1", "0", "0"])
     # binary_str = str(col_map)
-    entropy_value = _compute_entropy(binary_string_list)
+    entropy_value = compute_entropy(binary_string_list)
 
     assert entropy_value == 1
 
+    # entropy per row
+    col_map = np.array([[1, 5, 5, 1, 1, 5], [2, 2, 2, 2, 2, 2]])
+    entropy_values = compute_entropy(col_map)
+
+    np.testing.assert_array_equal(entropy_values, np.array([1, 0]))
+
+    # same entropy counting integers with bincount or sorting values
+    rgn = default_rng(0)
+    col_map = rgn.integers(0, 50, size=(3, 200))
+    np.testing.assert_allclose(
+        compute_entropy(col_map), compute_entropy(col_map.astype(str)))
+
+    # Miller-Madow bias correction
+    entropy_value = compute_entropy([1, 5, 5, 1, 1, 5],
+                                    estimator="miller_madow")
+    assert entropy_value == pytest.approx(1 + 1 / (12 * np.log(2)))
+
+    # testing argument checker
+    with pytest.raises(ValueError) as exc_info:
+        entropy_value = compute_entropy([1, 5], estimator="grassberger")
+    assert exc_info.type == ValueError
+
+
+def test_coalition_entropy_epochs():
+    """Test computation of ACE and SCE over epochs."""
+    rgn = default_rng(0)
+    data = rgn.standard_normal((3, 4, 100)).cumsum(axis=-1)
+
+    # one value per epoch, with the same seed for the first epoch
+    ace_values = amplitude_coalition_entropy(data, random_state=0)
+
+    assert ace_values.shape == (3,)
+    assert ace_values[0] == amplitude_coalition_entropy(
+        data[0], random_state=0)
+
+    # the normalization of SCE is the same for every epoch
+    sce_values, sce_per_channel = synchrony_coalition_entropy(
+        data, per_channel=True, random_state=0)
+    for epoch_idx, epoch in enumerate(data):
+        sce_value, sce_true_per_channel = synchrony_coalition_entropy(
+            epoch, per_channel=True, random_state=0)
+
+        assert sce_values[epoch_idx] == sce_value
+        np.testing.assert_array_equal(
+            sce_per_channel[epoch_idx], sce_true_per_channel)
+
+    # same values computing the synchrony matrix in blocks
+    block_sce_values, block_sce_per_channel = synchrony_coalition_entropy(
+        data, per_channel=True, random_state=0, memory_budget=1000)
+    np.testing.assert_array_equal(sce_values, block_sce_values)
+    np.testing.assert_array_equal(sce_per_channel, block_sce_per_channel)
+
+    # same values running in parallel
+    parallel_ace_values = amplitude_coalition_entropy(
+        data, random_state=0, n_jobs=2)
+    np.testing.assert_array_equal(ace_values, parallel_ace_values)
+
+    # testing argument checker
+    with pytest.raises(ValueError) as exc_info:
+        ace = amplitude_coalition_entropy(data[np.newaxis])
+    assert exc_info.type == ValueError
+
+
+def test_windowed_entropy():
+    """Test the entropy of sliding windows with a rolling histogram."""
+    # testing correct operation
+    rgn = default_rng(0)
+    col_map = rgn.integers(0, 16, 1000)
+    for window_size, step in [(100, 1), (100, 30), (100, 250)]:
+        entropy_values = _windowed_entropy(col_map, window_size, step)
+        starts = range(0, len(col_map) - window_size + 1, step)
+        true_entropy_values = [
+            compute_entropy(col_map[start:start + window_size])
+            for start in starts
+        ]
+
+        np.testing.assert_allclose(entropy_values, true_entropy_values)
+
+
+def test_windowed_amplitude_coalition_entropy():
+    """Test computation of ACE over sliding windows."""
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((4, 1000)).cumsum(axis=-1)
+    ace_values = windowed_amplitude_coalition_entropy(data, 200, 10)
+
+    assert ace_values.shape == (81,)
+    ace_values = windowed_amplitude_coalition_entropy(
+        data, 200, 10, thr_method="median")
+    assert ace_values.shape == (81,)
+
+    # with the thresholds of the whole recording, a quiet first half is
+    # all below the thresholds of the loud second half, so its ACE is 0
+    # (away from the edges of the Hilbert transform)
+    loud_data = np.concatenate([data, 100 * data], axis=-1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        ace_values = windowed_amplitude_coalition_entropy(
+            loud_data, 200, 100)
+    assert np.all(ace_values[1:8] == 0)
+    assert np.all(ace_values[-5:] > 0)
+
+    # each window is binarized with its own thresholds
+    ace_values = windowed_amplitude_coalition_entropy(
+        loud_data, 200, 100, per_window=True)
+    assert ace_values.shape == (19,)
+    assert np.all(ace_values > 0)
+    ace_values = windowed_amplitude_coalition_entropy(
+        data, 200, 10, thr_method="median", per_window=True)
+    assert ace_values.shape == (81,)
+
+    # one window over the whole recording is the usual ACE
+    ace_values = windowed_amplitude_coalition_entropy(
+        data, 1000, 1, random_state=0)
+    np.testing.assert_allclose(
+        ace_values, [amplitude_coalition_entropy(data, random_state=0)])
+    ace_values = windowed_amplitude_coalition_entropy(
+        data, 1000, 1, random_state=0, per_window=True)
+    np.testing.assert_allclose(
+        ace_values, [amplitude_coalition_entropy(data, random_state=0)])
+
+    # single precision, close to double precision
+    ace_values = windowed_amplitude_coalition_entropy(
+        data, 200, 100, random_state=0)
+    np.testing.assert_allclose(
+        windowed_amplitude_coalition_entropy(
+            data, 200, 100, random_state=0, dtype=np.float32),
+        ace_values, atol=0.02)
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        ace_values = windowed_amplitude_coalition_entropy([[]], 200, 10)
+    assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        ace_values = windowed_amplitude_coalition_entropy(data, 200, 0)
+    assert exc_info.type == ValueError
+
+    with pytest.raises(ValueError) as exc_info:
+        ace_values = windowed_amplitude_coalition_entropy(data, 2000, 10)
+    assert exc_info.type == ValueError
+
+    with pytest.raises(ValueError) as exc_info:
+        ace_values = windowed_amplitude_coalition_entropy(
+            data, 200, 10, thr_method="max")
+    assert exc_info.type == ValueError
+
+
+def test_amplitude_coalition_entropy_constant():
+    """Test ACE normalization when every channel is constant."""
+    # testing correct operation
+    binary_matrix = np.ones((2, 3, 50), dtype=np.int8)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        ace_values = _amplitude_coalition_entropy_binary(
+            binary_matrix, np.random.SeedSequence(0).spawn(2))
+
+    np.testing.assert_array_equal(ace_values, [0, 0])
+
 
 def test_amplitude_coalition_entropy():
     """Test computation of amplitude coalition entropy metric."""
@@ -53,6 +219,13 @@ def test_amplitude_coalition_entropy():
 
     assert ace_1 < ace_2
 
+    # several surrogates
+    ace_3, surrogate_mean, surrogate_std = amplitude_coalition_entropy(
+        data, random_state=0, n_surrogates=20, return_surrogates=True)
+    assert np.isclose(ace_3, amplitude_coalition_entropy(
+        data, random_state=0, n_surrogates=20))
+    assert surrogate_mean > 0 and surrogate_std > 0
+
     # testing argument checker
     data = [[]]
     with pytest.raises(TypeError) as exc_info:
@@ -82,8 +255,29 @@ def test_synchrony_coalition_entropy():
 
     assert sce_1 < sce_2
 
+    # cached and analytic normalization
+    assert (synchrony_coalition_entropy(data, random_state=0)
+            == synchrony_coalition_entropy(data, random_state=0))
+    sce_analytic = synchrony_coalition_entropy(
+        data, random_state=0, normalization="analytic")
+    assert np.isclose(sce_analytic, sce_2, atol=0.1)
+
+    random_values = [_sce_normalization_value(5, 200, random_state=seed)
+                     for seed in range(100)]
+    assert np.isclose(_expected_random_entropy(5, 200),
+                      np.mean(random_values), atol=0.02)
+
     # testing argument checker
     data = [[]]
     with pytest.raises(TypeError) as exc_info:
         sce = synchrony_coalition_entropy(data)
     assert exc_info.type == TypeError
+
+    data = np.array([x1, x2])
+    with pytest.raises(ValueError) as exc_info:
+        sce = synchrony_coalition_entropy(data, normalization="shuffle")
+    assert exc_info.type == ValueError
+
+    with pytest.raises(ValueError) as exc_info:
+        sce = synchrony_coalition_entropy(data, memory_budget=True)
+    assert exc_info.type == ValueError
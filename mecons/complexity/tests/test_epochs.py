@@ -0,0 +1,109 @@
+"""Tests for complexity metrics on MNE objects."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import numpy as np
+from numpy.random import default_rng
+import pytest
+import mne
+
+from mecons.complexity import compute_epochs_metrics, compute_metrics
+from mecons.complexity.epochs import _picks_to_idx
+
+
+def _create_raw(tmp_path):
+    """Create a lazily loaded Raw object and its events."""
+    rgn = default_rng(0)
+    info = mne.create_info(
+        ["EEG 1", "EEG 2", "EEG 3", "STI"], sfreq=100.,
+        ch_types=["eeg", "eeg", "eeg", "stim"])
+    data = rgn.standard_normal((4, 2000)).cumsum(axis=-1)
+    raw = mne.io.RawArray(data, info, verbose=False)
+    fname = str(tmp_path / "test_raw.fif")
+    raw.save(fname, fmt="double", verbose=False)
+    raw = mne.io.read_raw_fif(fname, preload=False, verbose=False)
+
+    events = np.array([[sample, 0, 1 + idx % 2]
+                       for idx, sample in enumerate(range(100, 1900, 200))])
+
+    return raw, events
+
+
+def test_compute_epochs_metrics(tmp_path):
+    """Test computation of the metrics per epoch of MNE objects."""
+    # testing correct operation
+    raw, events = _create_raw(tmp_path)
+    event_id = dict(auditory=1, visual=2)
+    epochs = mne.Epochs(raw, events, event_id, tmin=-0.5, tmax=0.99,
+                        baseline=None, preload=False, verbose=False)
+
+    results = compute_epochs_metrics(
+        epochs, picks="eeg", tmin=0., tmax=0.5, event_id="visual",
+        random_state=0, per_channel=True)
+
+    assert results.shape == (4,)
+    np.testing.assert_array_equal(results["epoch"], [1, 3, 5, 7])
+    np.testing.assert_array_equal(results["event"], [2, 2, 2, 2])
+    assert list(results["condition"]) == ["visual"] * 4
+    assert results["sce_per_channel"].shape == (4, 3)
+
+    # same values as the metrics on the selected data
+    data = epochs["visual"].get_data(picks="eeg", tmin=0., tmax=0.5)
+    expected = compute_metrics(data, random_state=0, per_channel=True)
+    for metric in expected:
+        np.testing.assert_allclose(results[metric], expected[metric])
+
+    # raw objects are epoched with the events, in parallel
+    raw_results = compute_epochs_metrics(
+        raw, picks="eeg", events=events, event_id=event_id, tmin=-0.5,
+        tmax=0.99, random_state=0, n_jobs=2)
+    epochs_results = compute_epochs_metrics(
+        epochs, picks="eeg", random_state=0)
+    np.testing.assert_array_equal(raw_results, epochs_results)
+
+    # without events, the recording is one epoch
+    results = compute_epochs_metrics(raw, picks=[0, 1], metrics="lzc",
+                                     random_state=0)
+    assert results.shape == (1,)
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        results = compute_epochs_metrics(data)
+    assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        results = compute_epochs_metrics(epochs, output="list")
+    assert exc_info.type == ValueError
+
+
+def test_picks_to_idx(tmp_path):
+    """Test selecting channels of MNE objects."""
+    # testing correct operation
+    raw, _ = _create_raw(tmp_path)
+    raw.info["bads"] = ["EEG 2"]
+
+    assert _picks_to_idx(raw.info, None) == [0, 1, 2, 3]
+    assert _picks_to_idx(raw.info, "eeg") == [0, 1, 2]
+    assert _picks_to_idx(raw.info, "data") == [0, 1, 2]
+    assert _picks_to_idx(raw.info, ["EEG 3", "STI"]) == [2, 3]
+    assert _picks_to_idx(raw.info, [1, 3]) == [1, 3]
+    # the data is not loaded
+    assert not raw.preload
+
+
+def test_compute_epochs_metrics_dataframe(tmp_path):
+    """Test the DataFrame output of the metrics per epoch."""
+    pytest.importorskip("pandas")
+    raw, events = _create_raw(tmp_path)
+    epochs = mne.Epochs(raw, events, tmin=-0.5, tmax=0.99, baseline=None,
+                        preload=False, verbose=False)
+
+    results = compute_epochs_metrics(
+        epochs, picks="eeg", random_state=0, per_channel=True,
+        output="dataframe")
+
+    assert results.index.names == ["epoch", "event"]
+    assert "sce_EEG 1" in results.columns
+    assert len(results) == len(events)
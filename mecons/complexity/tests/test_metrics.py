@@ -0,0 +1,109 @@
+"""Tests for computing several complexity metrics at once."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import numpy as np
+from numpy.random import default_rng
+import pytest
+
+from mecons.complexity import (
+    compute_metrics,
+    lempel_ziv_complexity,
+    amplitude_coalition_entropy,
+    synchrony_coalition_entropy
+)
+
+
+def test_compute_metrics():
+    """Test computation of several metrics sharing preprocessing."""
+    # testing correct operation
+    # same values as computing each metric separately
+    rgn = default_rng(0)
+    data = rgn.standard_normal((4, 200)).cumsum(axis=1)
+
+    results = compute_metrics(data, per_channel=True, random_state=0)
+
+    lzc = lempel_ziv_complexity(data, random_state=0)
+    ace = amplitude_coalition_entropy(data, random_state=0)
+    sce, sce_per_channel = synchrony_coalition_entropy(
+        data, per_channel=True, random_state=0)
+
+    assert results["lzc"] == lzc
+    assert results["ace"] == ace
+    assert results["sce"] == sce
+    np.testing.assert_array_equal(results["sce_per_channel"], sce_per_channel)
+
+    # one value per epoch
+    results = compute_metrics(
+        np.array([data, data[::-1]]), per_channel=True)
+    for metric in ["lzc", "ace", "sce"]:
+        assert results[metric].shape == (2,)
+    assert results["sce_per_channel"].shape == (2, 4)
+
+    # same values running in parallel
+    epochs_data = np.array([data, data[::-1], 2 * data])
+    results = compute_metrics(epochs_data, random_state=0)
+    parallel_results = compute_metrics(epochs_data, random_state=0, n_jobs=2)
+    for metric in results:
+        np.testing.assert_array_equal(
+            results[metric], parallel_results[metric])
+
+    # same normalization with several surrogates
+    results = compute_metrics(
+        data, metrics=["lzc", "ace"], random_state=0, n_surrogates=5)
+    assert results["lzc"] == lempel_ziv_complexity(
+        data, random_state=0, n_surrogates=5)
+    assert results["ace"] == amplitude_coalition_entropy(
+        data, random_state=0, n_surrogates=5)
+
+    # single precision pipeline, close to double precision (rounding can
+    # only flip the few samples lying at the binarization threshold)
+    double_results = compute_metrics(data, random_state=0)
+    results = compute_metrics(data, random_state=0, dtype=np.float32)
+    for metric in ["lzc", "ace", "sce"]:
+        np.testing.assert_allclose(
+            results[metric], double_results[metric], atol=0.02)
+
+    # same Hilbert transform options as computing each metric separately
+    padded_data = rgn.standard_normal((4, 211)).cumsum(axis=1)
+    results = compute_metrics(
+        padded_data, random_state=0, pad=True, workers=2)
+    assert results["lzc"] == lempel_ziv_complexity(
+        padded_data, random_state=0, pad=True, workers=2)
+    assert results["ace"] == amplitude_coalition_entropy(
+        padded_data, random_state=0, pad=True, workers=2)
+    assert results["sce"] == synchrony_coalition_entropy(
+        padded_data, random_state=0, pad=True, workers=2)
+    assert synchrony_coalition_entropy(
+        padded_data, random_state=0, pad=True, memory_budget=2000
+    ) == results["sce"]
+
+    # only the requested metrics are computed
+    results = compute_metrics(data, metrics="ace")
+    assert list(results) == ["ace"]
+
+    # same SCE values computing the synchrony matrix in blocks
+    block_results = compute_metrics(
+        data, metrics="sce", per_channel=True, random_state=0,
+        memory_budget=2000)
+    assert block_results["sce"] == sce
+    np.testing.assert_array_equal(
+        block_results["sce_per_channel"], sce_per_channel)
+
+    # testing argument checker
+    data = [[]]
+    with pytest.raises(TypeError) as exc_info:
+        results = compute_metrics(data)
+    assert exc_info.type == TypeError
+
+    data = np.zeros((2, 10))
+    with pytest.raises(ValueError) as exc_info:
+        results = compute_metrics(data, metrics=["pci"])
+    assert exc_info.type == ValueError
+
+    for memory_budget in [0, -1, 1e5, True]:
+        with pytest.raises(ValueError) as exc_info:
+            results = compute_metrics(data, memory_budget=memory_budget)
+        assert exc_info.type == ValueError
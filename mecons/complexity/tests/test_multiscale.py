@@ -0,0 +1,95 @@
+"""Tests for complexity metrics over several temporal scales."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import numpy as np
+from numpy.random import default_rng
+import pytest
+
+from mecons.complexity import compute_metrics, compute_multiscale_metrics
+from mecons.complexity.multiscale import _coarse_grain
+
+
+def test_compute_multiscale_metrics():
+    """Test computation of LZc and ACE over several scales."""
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((3, 4, 500)).cumsum(axis=-1)
+    results = compute_multiscale_metrics(data, scales=4, random_state=0)
+
+    assert list(results) == ["lzc", "ace"]
+    assert results["lzc"].shape == results["ace"].shape == (3, 4)
+
+    # scale 1 is the same as computing the metrics without coarse-graining
+    values = compute_metrics(data, metrics=["lzc", "ace"], random_state=0)
+    np.testing.assert_array_equal(results["lzc"][:, 0], values["lzc"])
+    np.testing.assert_array_equal(results["ace"][:, 0], values["ace"])
+
+    # one profile per metric without epochs, same as the first epoch
+    profiles = compute_multiscale_metrics(
+        data[0], scales=[1, 2, 5], metrics="lzc", coarse_graining="decimate",
+        method="lz76", random_state=0)
+    assert list(profiles) == ["lzc"]
+    assert profiles["lzc"].shape == (3,)
+    np.testing.assert_array_equal(
+        profiles["lzc"], compute_multiscale_metrics(
+            data, scales=[1, 2, 5], metrics="lzc", coarse_graining="decimate",
+            method="lz76", random_state=0)["lzc"][0])
+
+    # same values running in parallel
+    parallel_results = compute_multiscale_metrics(
+        data, scales=4, random_state=0, n_jobs=2)
+    np.testing.assert_array_equal(results["lzc"], parallel_results["lzc"])
+    np.testing.assert_array_equal(results["ace"], parallel_results["ace"])
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        compute_multiscale_metrics([[]])
+    assert exc_info.type == TypeError
+
+    with pytest.raises(TypeError) as exc_info:
+        compute_multiscale_metrics(data, scales=[1, 2.5])
+    assert exc_info.type == TypeError
+
+    for scales in [True, [1, True]]:
+        with pytest.raises(TypeError) as exc_info:
+            compute_multiscale_metrics(data, scales=scales)
+        assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        compute_multiscale_metrics(data, scales=[0, 1])
+    assert exc_info.type == ValueError
+
+    # at least 2 coarse-grained samples
+    for scales, coarse_graining in [(500, "mean"), (251, "mean"),
+                                    (500, "decimate")]:
+        with pytest.raises(ValueError) as exc_info:
+            compute_multiscale_metrics(
+                data, scales=[scales], coarse_graining=coarse_graining)
+        assert exc_info.type == ValueError
+    results = compute_multiscale_metrics(
+        data, scales=[250, 499], metrics="ace", coarse_graining="decimate",
+        random_state=0)
+    assert np.all(np.isfinite(results["ace"]))
+
+    with pytest.raises(ValueError) as exc_info:
+        compute_multiscale_metrics(data, metrics=["sce"])
+    assert exc_info.type == ValueError
+
+    with pytest.raises(ValueError) as exc_info:
+        compute_multiscale_metrics(data, coarse_graining="max")
+    assert exc_info.type == ValueError
+
+
+def test_coarse_grain():
+    """Test coarse-graining of the Hilbert amplitude."""
+    # testing correct operation
+    data = np.arange(14, dtype=np.float64).reshape(2, 7)
+
+    assert _coarse_grain(data, 1) is data
+    np.testing.assert_array_equal(
+        _coarse_grain(data, 3), [[1, 4], [8, 11]])
+    np.testing.assert_array_equal(
+        _coarse_grain(data, 3, "decimate"), [[0, 3, 6], [7, 10, 13]])
@@ -4,6 +4,11 @@
 
 from .binary import (binarize_hilbert_amplitude, binary_matrix_to_string,
                      map_matrix_to_integer, compute_synchrony_matrix,
-                     create_random_binary_matrix)
+                     create_random_binary_matrix, pack_binary_matrix,
+                     PackedBinaryMatrix)
 
 from .preprocessing import detrending_normalization
+from .baseline import set_cache_dir, get_cache_dir, clear_cache
+from .chunks import iter_epochs
+from .profiling import Profiler
+from .backend import set_backend, get_backend
@@ -0,0 +1,217 @@
+"""Numba kernels of the sequential loops of the metrics.
+
+This module is only imported if the backend is 'numba' (see set_backend).
+Each kernel gives the same results as its NumPy implementation.
+"""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def lzw_dictionary_size(symbols):
+    """Return the size of the dictionary of LZW compression.
+
+    Same as _lempel_ziv_welch_trie, with the trie in a preallocated array.
+
+    Parameters
+    ----------
+    symbols : ndarray of uint8, shape (n_symbols,)
+        Binary sequence.
+
+    Returns
+    -------
+    int
+        Size of the dictionary of binary words.
+    """
+    n_symbols = symbols.shape[0]
+    if n_symbols == 0:
+        return 0
+
+    # at most one node per symbol, plus the root and one-symbol words
+    children = np.zeros(2 * (n_symbols + 3), dtype=np.int64)
+    children[0] = 1
+    children[1] = 2
+    n_nodes = 3
+    node = children[symbols[0]]
+    for idx in range(1, n_symbols):
+        c = symbols[idx]
+        child = children[2 * node + c]
+        if child != 0:
+            node = child
+        else:
+            children[2 * node + c] = n_nodes
+            n_nodes += 1
+            node = children[c]
+
+    return n_nodes - 2
+
+
+@njit(cache=True)
+def lz76_complexity(symbols):
+    """Return the number of phrases of the LZ76 parsing.
+
+    Same as _lempel_ziv_76, with the suffix automaton in preallocated
+    arrays.
+
+    Parameters
+    ----------
+    symbols : ndarray of uint8, shape (n_symbols,)
+        Binary sequence.
+
+    Returns
+    -------
+    int
+        Number of phrases (LZ76 complexity).
+    """
+    n_symbols = symbols.shape[0]
+    if n_symbols == 0:
+        return 0
+
+    max_states = 2 * n_symbols + 1
+    transitions = np.full(2 * max_states, -1, dtype=np.int64)
+    links = np.full(max_states, -1, dtype=np.int64)
+    lengths = np.zeros(max_states, dtype=np.int64)
+    first_ends = np.zeros(max_states, dtype=np.int64)
+    n_states = 1
+    last = 0
+    for end in range(n_symbols):
+        c = symbols[end]
+        state = n_states
+        n_states += 1
+        lengths[state] = lengths[last] + 1
+        first_ends[state] = end
+        p = last
+        while p != -1 and transitions[2 * p + c] == -1:
+            transitions[2 * p + c] = state
+            p = links[p]
+        if p == -1:
+            links[state] = 0
+        else:
+            q = transitions[2 * p + c]
+            if lengths[p] + 1 == lengths[q]:
+                links[state] = q
+            else:
+                clone = n_states
+                n_states += 1
+                lengths[clone] = lengths[p] + 1
+                transitions[2 * clone] = transitions[2 * q]
+                transitions[2 * clone + 1] = transitions[2 * q + 1]
+                links[clone] = links[q]
+                first_ends[clone] = first_ends[q]
+                while p != -1 and transitions[2 * p + c] == q:
+                    transitions[2 * p + c] = clone
+                    p = links[p]
+                links[q] = clone
+                links[state] = clone
+        last = state
+
+    n_phrases = 0
+    start = 0
+    while start < n_symbols:
+        state = 0
+        length = 0
+        while start + length < n_symbols:
+            state = transitions[2 * state + symbols[start + length]]
+            if state == -1 or first_ends[state] >= start + length:
+                break
+            length += 1
+        n_phrases += 1
+        start += length + 1
+
+    return n_phrases
+
+
+@njit(cache=True)
+def synchrony_matrix(real, imag, scaled_amplitude, amplitude, out, packed):
+    """Fill the binary synchrony matrix of one epoch.
+
+    Same as _synchrony_from_analytic, without temporary arrays per pair.
+
+    Parameters
+    ----------
+    real, imag : ndarray of float, shape (n_channels, n_times)
+        Real and imaginary parts of the analytic signal.
+    scaled_amplitude : ndarray of float, shape (n_channels, n_times)
+        Amplitude of the analytic signal times cos(threshold).
+    amplitude : ndarray of float, shape (n_channels, n_times)
+        Amplitude of the analytic signal.
+    out : ndarray of uint8, shape (n_channels, n_channels - 1, n_values)
+        Output filled with zeros. n_values is n_times, or the number of
+        bytes if packed.
+    packed : bool
+        If True, the values are packed in bytes as numpy.packbits.
+    """
+    n_channels, n_times = real.shape
+    for i in range(n_channels - 1):
+        for j in range(i + 1, n_channels):
+            for t in range(n_times):
+                product = real[i, t] * real[j, t] + imag[i, t] * imag[j, t]
+                if product > scaled_amplitude[i, t] * amplitude[j, t]:
+                    if packed:
+                        bit = np.uint8(1 << (7 - (t & 7)))
+                        out[i, j - 1, t >> 3] |= bit
+                        out[j, i, t >> 3] |= bit
+                    else:
+                        out[i, j - 1, t] = 1
+                        out[j, i, t] = 1
+
+
+@njit(cache=True)
+def channel_synchrony(real, imag, scaled_amplitude, amplitude, ch_idx, out):
+    """Fill the synchrony of one channel with the other channels.
+
+    Same as _channel_synchrony_from_analytic for one epoch, with the same
+    rounding as synchrony_matrix.
+
+    Parameters
+    ----------
+    real, imag : ndarray of float, shape (n_channels, n_times)
+        Real and imaginary parts of the analytic signal.
+    scaled_amplitude : ndarray of float, shape (n_channels, n_times)
+        Amplitude of the analytic signal times cos(threshold).
+    amplitude : ndarray of float, shape (n_channels, n_times)
+        Amplitude of the analytic signal.
+    ch_idx : int
+        Index of the channel.
+    out : ndarray of int8, shape (n_channels - 1, n_times)
+        Output, the row of channel j is j if j < ch_idx, j - 1 otherwise.
+    """
+    n_channels, n_times = real.shape
+    for j in range(n_channels):
+        if j == ch_idx:
+            continue
+        # the pair is computed from its lower channel, as synchrony_matrix
+        lower, higher = min(j, ch_idx), max(j, ch_idx)
+        row = j if j < ch_idx else j - 1
+        for t in range(n_times):
+            product = (real[lower, t] * real[higher, t]
+                       + imag[lower, t] * imag[higher, t])
+            if product > scaled_amplitude[lower, t] * amplitude[higher, t]:
+                out[row, t] = 1
+            else:
+                out[row, t] = 0
+
+
+@njit(cache=True)
+def column_codes(binary_matrix, out):
+    """Map each binary column onto an integer, row i being the bit i.
+
+    Parameters
+    ----------
+    binary_matrix : ndarray, shape (n_matrices, n_rows, n_columns)
+        Binary matrices with at most 64 rows.
+    out : ndarray of int64 or uint64, shape (n_matrices, n_columns)
+        Output.
+    """
+    n_matrices, n_rows, n_columns = binary_matrix.shape
+    for k in range(n_matrices):
+        for col in range(n_columns):
+            code = np.uint64(0)
+            for row in range(n_rows):
+                if binary_matrix[k, row, col]:
+                    code |= np.uint64(1) << np.uint64(row)
+            out[k, col] = code
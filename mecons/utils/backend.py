@@ -0,0 +1,75 @@
+"""Useful functions for selecting the backend of the compiled kernels."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+BACKENDS = ("auto", "numpy", "numba")
+
+# backend set by the user, 'auto' uses numba if it is installed
+_backend = "auto"
+_has_numba = None
+
+
+def set_backend(backend="auto"):
+    """Set the backend used for the sequential loops of the metrics.
+
+    The LZW parsing of LZc, the synchrony matrix of SCE and the column
+    coding of ACE and SCE have Numba kernels. Both backends give identical
+    results. The Numba kernels are compiled on first use and cached to
+    disk, so other processes (e.g. with n_jobs) don't compile them again.
+
+    Parameters
+    ----------
+    backend : str, optional (default "auto")
+        If 'numba', the Numba kernels are used (requires numba). If 'numpy',
+        the pure NumPy implementations are used. If 'auto', Numba is used if
+        it is installed.
+    """
+    global _backend
+
+    if backend not in BACKENDS:
+        raise ValueError(
+            "The backend should be 'auto', 'numpy' or 'numba'.")
+
+    if backend == "numba" and not _numba_available():
+        raise ImportError("numba is required for the 'numba' backend.")
+
+    _backend = backend
+
+
+def get_backend():
+    """Get the backend used for the sequential loops of the metrics.
+
+    Returns
+    -------
+    str
+        Backend in use, 'numba' or 'numpy'.
+    """
+    if _backend == "auto":
+        return "numba" if _numba_available() else "numpy"
+
+    return _backend
+
+
+def _numba_available():
+    """Return True if numba can be imported."""
+    global _has_numba
+
+    if _has_numba is None:
+        try:
+            import numba  # noqa: F401
+            _has_numba = True
+        except ImportError:
+            _has_numba = False
+
+    return _has_numba
+
+
+def _get_kernels():
+    """Return the module with the Numba kernels, None for NumPy."""
+    if get_backend() != "numba":
+        return None
+
+    from . import _numba_kernels
+
+    return _numba_kernels
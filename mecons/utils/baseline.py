@@ -0,0 +1,144 @@
+"""Useful functions for caching normalization baselines."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import os
+import os.path as op
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+# maximum number of baselines kept in memory
+_MAX_CACHE_SIZE = 256
+_memory_cache = OrderedDict()
+_cache_dir = None
+
+
+def set_cache_dir(cache_dir):
+    """Set the directory used to store normalization baselines on disk.
+
+    By default, the environment variable MECONS_CACHE_DIR is used, if set.
+
+    Parameters
+    ----------
+    cache_dir : str | None
+        Directory to store the baselines. If None, the baselines are only
+        cached in memory (unless MECONS_CACHE_DIR is set).
+    """
+    global _cache_dir
+
+    if cache_dir is not None and not isinstance(cache_dir, str):
+        raise TypeError("The cache directory should be a string or None.")
+
+    _cache_dir = cache_dir
+
+
+def get_cache_dir():
+    """Get the directory used to store normalization baselines on disk.
+
+    Returns
+    -------
+    str | None
+        Directory to store the baselines, None if they are only cached in
+        memory.
+    """
+    if _cache_dir is not None:
+        return _cache_dir
+
+    return os.environ.get("MECONS_CACHE_DIR", None)
+
+
+def clear_cache():
+    """Clear the normalization baselines cached in memory."""
+    _memory_cache.clear()
+
+
+def _get_cache_seed(random_state):
+    """Return the integer seed to cache baselines, None if not cacheable.
+
+    Only baselines computed from an integer random state are reproducible,
+    so they are the only ones cached.
+    """
+    if isinstance(random_state, (int, np.integer)):
+        return int(random_state)
+
+    return None
+
+
+def _cached_baseline(name, key, compute):
+    """Return a baseline from the cache, computing it if needed.
+
+    The baselines are kept in memory with a least-recently-used bound, and
+    on disk if a cache directory is set.
+
+    Parameters
+    ----------
+    name : str
+        Name of the baseline, e.g. 'sce'.
+    key : tuple of int
+        Parameters defining the baseline, e.g. (n_rows, n_times, seed).
+    compute : callable
+        Function without arguments computing the baseline (float or
+        ndarray).
+
+    Returns
+    -------
+    float or ndarray
+        Baseline value.
+    """
+    cache_key = (name,) + tuple(key)
+    if cache_key in _memory_cache:
+        _memory_cache.move_to_end(cache_key)
+        return _memory_cache[cache_key]
+
+    value = None
+    fname = None
+    cache_dir = get_cache_dir()
+    if cache_dir is not None:
+        fname = op.join(
+            cache_dir,
+            "%s_baseline_%s.npy" % (name, "_".join(str(k) for k in key))
+        )
+        if op.isfile(fname):
+            value = np.load(fname)[()]
+
+    if value is None:
+        value = compute()
+        if fname is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            _save_atomic(fname, value)
+
+    _memory_cache[cache_key] = value
+    if len(_memory_cache) > _MAX_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+    return value
+
+
+def _save_atomic(fname, value):
+    """Save a baseline, so other processes never read a partial file.
+
+    The baseline is written to a temporary file in the same directory and
+    then renamed, which replaces the destination at once.
+    """
+    fd, tmp_fname = tempfile.mkstemp(
+        suffix=".npy", dir=op.dirname(fname) or None)
+    try:
+        with os.fdopen(fd, "wb") as fid:
+            np.save(fid, value)
+        os.replace(tmp_fname, fname)
+    except BaseException:
+        if op.exists(tmp_fname):
+            os.remove(tmp_fname)
+        raise
+
+
+def _check_n_surrogates(n_surrogates):
+    """Check the number of surrogates used for normalization."""
+    if not isinstance(n_surrogates, (int, np.integer)):
+        raise TypeError("The parameter n_surrogates should be an integer.")
+
+    if n_surrogates < 1:
+        raise ValueError("The parameter n_surrogates should be positive.")
@@ -7,10 +7,127 @@
 # License : BSD-3-Clause
 
 import numpy as np
-from scipy import signal
+from .preprocessing import _analytic_signal, _check_dtype
+from .profiling import _start_stage, _end_stage
+from .backend import _get_kernels
 
+# maximum number of bytes of the windows copied at once to compute their
+# median thresholds
+_WINDOW_CHUNK_BYTES = 2 ** 24
 
-def binarize_hilbert_amplitude(data, thr_method="mean"):
+
+class PackedBinaryMatrix:
+    """Binary matrix with its last axis stored as packed bits.
+
+    Eight binary values are stored per byte (see ``numpy.packbits``), which
+    reduces the memory footprint of binary matrices by a factor of 8.
+
+    Parameters
+    ----------
+    packed : ndarray of uint8, shape (..., n_bytes)
+        Packed binary values, with ``n_bytes = ceil(n_times / 8)``.
+    n_times : int
+        Number of binary values along the last axis.
+    """
+
+    def __init__(self, packed, n_times):
+        if not isinstance(packed, np.ndarray) or packed.dtype != np.uint8:
+            raise TypeError("The packed data should be a ndarray of uint8.")
+
+        if not isinstance(n_times, (int, np.integer)):
+            raise TypeError("The number of values n_times must be integer.")
+
+        if packed.ndim == 0 or packed.shape[-1] != (n_times + 7) // 8:
+            raise ValueError(
+                "The last axis of the packed data doesn't match n_times.")
+
+        self.packed = packed
+        self.n_times = int(n_times)
+
+    @property
+    def shape(self):
+        """Shape of the unpacked binary matrix."""
+        return self.packed.shape[:-1] + (self.n_times,)
+
+    @property
+    def ndim(self):
+        """Number of dimensions of the unpacked binary matrix."""
+        return self.packed.ndim
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by the packed data."""
+        return self.packed.nbytes
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, item):
+        """Index the leading axes (the packed axis can't be indexed)."""
+        if not isinstance(item, tuple):
+            item = (item,)
+        # "Ellipsis in item" compares with ==, which fails for ndarrays
+        if len(item) >= self.packed.ndim or \
+                any(index is Ellipsis for index in item):
+            raise IndexError("Only the leading axes can be indexed.")
+
+        return PackedBinaryMatrix(self.packed[item], self.n_times)
+
+    def __repr__(self):
+        return "<PackedBinaryMatrix | shape %s, %d bytes>" % (
+            self.shape, self.nbytes)
+
+    def unpack(self):
+        """Unpack the binary matrix.
+
+        Returns
+        -------
+        ndarray of int8, shape (..., n_times)
+            Binary matrix.
+        """
+        binary_matrix = np.unpackbits(
+            self.packed, axis=-1, count=self.n_times)
+
+        return binary_matrix.view(np.int8)
+
+
+def pack_binary_matrix(binary_matrix):
+    """Pack a binary matrix into bits along its last axis.
+
+    Parameters
+    ----------
+    binary_matrix : ndarray, shape (..., n_times)
+        Data matrix with binary values.
+
+    Returns
+    -------
+    PackedBinaryMatrix
+        Packed binary matrix.
+    """
+    if not isinstance(binary_matrix, np.ndarray):
+        raise TypeError("The input matrix 'data' should be ndarray.")
+
+    if binary_matrix.ndim == 0:
+        raise ValueError("The input matrix 'data' should be at least 1D.")
+
+    if np.any((binary_matrix != 0) & (binary_matrix != 1)):
+        raise ValueError("The input matrix 'data' should be binary.")
+
+    packed = np.packbits(binary_matrix.astype(bool, copy=False), axis=-1)
+
+    return PackedBinaryMatrix(packed, binary_matrix.shape[-1])
+
+
+def _unpack_if_needed(binary_matrix):
+    """Return the binary matrix as ndarray, unpacking it if needed."""
+    if isinstance(binary_matrix, PackedBinaryMatrix):
+        return binary_matrix.unpack()
+
+    return binary_matrix
+
+
+def binarize_hilbert_amplitude(data, thr_method="mean", packed=False,
+                               dtype=np.float64, pad=False, workers=None):
     """Binarize a multidimensional time series.
 
     Binaziration based on the instantaneous amplitude of the analytic signal.
@@ -18,47 +135,162 @@ def binarize_hilbert_amplitude(data, thr_method="mean"):
     Parameters
     ----------
     data : ndarray, shape (n_channels, n_times)
-        Multidimensional time series matrix.
+        Multidimensional time series matrix. Leading axes, e.g. epochs, are
+        kept, i.e. (..., n_channels, n_times).
     thr_method : str, optional (default "mean")
         If 'mean', the mean value of the Hilbert amplitude time series is used.
         If 'median' the median value is used.
+    packed : bool, optional (default False)
+        If True, returns the binarized matrix as PackedBinaryMatrix.
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the Hilbert transform, np.float64 (complex128) or
+        np.float32 (complex64). If None, the precision of the input is kept.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform, which is faster for lengths with large
+        prime factors but changes the values slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
 
     Returns
     -------
-    ndarray, shape (n_channels, n_times)
+    ndarray or PackedBinaryMatrix, shape (..., n_channels, n_times)
         Binarized data matrix.
     """
     if not isinstance(data, np.ndarray):
         raise TypeError("The input matrix 'data' should be ndarray.")
 
+    data = data.astype(_check_dtype(data, dtype), copy=False)
+
     if thr_method not in ["mean", "median"]:
         raise ValueError(
             "The parameter thr_method should be 'mean' or 'median'.")
 
-    n_channels, n_times = np.shape(data)
-    threshold = 0
-    hilbert_amplitude_matrix = np.zeros((n_channels, n_times))
-    binary_matrix = np.zeros((n_channels, n_times), dtype=np.int8)
+    # get Hilbert amplitude time series of all channels at once
+    hilbert_amplitude_matrix = np.abs(
+        _analytic_signal(data, pad=pad, workers=workers))
+
+    return _binarize_amplitude(
+        hilbert_amplitude_matrix, thr_method=thr_method, packed=packed)
 
-    for ch_idx in range(n_channels):
-        # get Hilbert amplitude time series
-        hilbert_amplitude_matrix[ch_idx, :] = abs(
-            signal.hilbert(data[ch_idx, :]))
 
-        # get threshold
-        if thr_method == "mean":
-            threshold = np.mean(hilbert_amplitude_matrix[ch_idx, :])
-        else:
-            threshold = np.median(hilbert_amplitude_matrix[ch_idx, :])
+def _binarize_amplitude(hilbert_amplitude_matrix, thr_method="mean",
+                        packed=False):
+    """Binarize Hilbert amplitude time series with a threshold per channel.
 
-        # binarize time series
-        for t in range(n_times):
-            if hilbert_amplitude_matrix[ch_idx, t] >= threshold:
-                binary_matrix[ch_idx, t] = 1
+    Parameters
+    ----------
+    hilbert_amplitude_matrix : ndarray, shape (n_channels, n_times)
+        Instantaneous amplitude of the analytic signal.
+    thr_method : str, optional (default "mean")
+        If 'mean', the mean value of the Hilbert amplitude time series is used.
+        If 'median' the median value is used.
+    packed : bool, optional (default False)
+        If True, returns the binarized matrix as PackedBinaryMatrix.
+
+    Returns
+    -------
+    ndarray or PackedBinaryMatrix, shape (n_channels, n_times)
+        Binarized data matrix. If ndarray, each (n_channels, n_times) matrix
+        is stored column-major, so concatenating it column-by-column is a
+        view.
+    """
+    start_stage = _start_stage()
+
+    # get threshold per channel (np.median uses a linear-time partition)
+    if thr_method == "mean":
+        threshold = np.mean(hilbert_amplitude_matrix, axis=-1, keepdims=True)
+    else:
+        threshold = np.median(
+            hilbert_amplitude_matrix, axis=-1, keepdims=True)
+
+    # binarize time series
+    if packed:
+        binary_matrix = PackedBinaryMatrix(
+            np.packbits(hilbert_amplitude_matrix >= threshold, axis=-1),
+            hilbert_amplitude_matrix.shape[-1]
+        )
+    else:
+        # compare on swapped axes, so the output is written column-major
+        binary_matrix = np.empty(
+            hilbert_amplitude_matrix.swapaxes(-1, -2).shape, dtype=np.int8)
+        np.greater_equal(
+            hilbert_amplitude_matrix.swapaxes(-1, -2),
+            threshold.swapaxes(-1, -2), out=binary_matrix, casting="unsafe")
+        binary_matrix = binary_matrix.swapaxes(-1, -2)
+
+    _end_stage("binarization", start_stage, binary_matrix)
 
     return binary_matrix
 
 
+def _check_windows(window_size, step, n_times):
+    """Check the size and the step of sliding windows over n_times."""
+    if not isinstance(window_size, (int, np.integer)) or \
+            not isinstance(step, (int, np.integer)):
+        raise TypeError("The window size and step must be integer.")
+
+    if window_size < 1 or step < 1 or window_size > n_times:
+        raise ValueError(
+            "The window size should be between 1 and n_times, and the step "
+            "should be positive.")
+
+
+def _window_thresholds(hilbert_amplitude_matrix, window_size, step,
+                       thr_method="mean"):
+    """Compute the binarization threshold of each sliding window.
+
+    Parameters
+    ----------
+    hilbert_amplitude_matrix : ndarray, shape (n_channels, n_times)
+        Instantaneous amplitude of the analytic signal.
+    window_size : int
+        Number of samples per window.
+    step : int
+        Number of samples between the starts of two consecutive windows.
+    thr_method : str, optional (default "mean")
+        If 'mean', the mean value of the window is used. If 'median' the
+        median value is used.
+
+    Returns
+    -------
+    ndarray, shape (n_channels, n_windows)
+        Threshold per channel and window.
+
+    Note: The medians are computed over chunks of windows, so at most about
+    _WINDOW_CHUNK_BYTES of windows are copied at once.
+    """
+    n_times = hilbert_amplitude_matrix.shape[-1]
+    _check_windows(window_size, step, n_times)
+
+    if thr_method not in ["mean", "median"]:
+        raise ValueError(
+            "The parameter thr_method should be 'mean' or 'median'.")
+
+    starts = np.arange(0, n_times - window_size + 1, step)
+    if thr_method == "mean":
+        # window sums from the cumulative sum, O(n_times) for all windows
+        cumsum = np.zeros(hilbert_amplitude_matrix.shape[:-1] + (n_times + 1,))
+        np.cumsum(hilbert_amplitude_matrix, axis=-1, out=cumsum[..., 1:])
+        return (cumsum[..., starts + window_size] - cumsum[..., starts]) \
+            / window_size
+
+    # selecting windows of the view copies them, so take a chunk at a time
+    windows = np.lib.stride_tricks.sliding_window_view(
+        hilbert_amplitude_matrix, window_size, axis=-1)
+    n_channels = int(np.prod(hilbert_amplitude_matrix.shape[:-1]))
+    chunk_size = max(_WINDOW_CHUNK_BYTES // (
+        n_channels * window_size * hilbert_amplitude_matrix.itemsize), 1)
+    thresholds = np.empty(hilbert_amplitude_matrix.shape[:-1] + starts.shape)
+    for chunk_start in range(0, len(starts), chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        thresholds[..., chunk] = np.median(
+            windows[..., starts[chunk], :], axis=-1, overwrite_input=True)
+
+    return thresholds
+
+
 def binary_matrix_to_string(binary_matrix):
     """Create one string being the binarized input matrix.
 
@@ -66,7 +298,7 @@ def binary_matrix_to_string(binary_matrix):
 
     Parameters
     ----------
-    binary_matrix : ndarray, shape (n_channels, n_times)
+    binary_matrix : ndarray or PackedBinaryMatrix, shape (n_channels, n_times)
         Data matrix with binary values.
 
     Returns
@@ -74,49 +306,79 @@ def binary_matrix_to_string(binary_matrix):
     str
         Binary string.
     """
-    if not isinstance(binary_matrix, np.ndarray):
+    if not isinstance(binary_matrix, (np.ndarray, PackedBinaryMatrix)):
         raise TypeError("The input matrix 'data' should be ndarray.")
 
-    n_rows, n_cols = np.shape(binary_matrix)
-    binary_str = str()
-    for j in range(n_cols):
-        for i in range(n_rows):
-            if binary_matrix[i, j] == 1:
-                binary_str += "1"
-            elif binary_matrix[i, j] == 0:
-                binary_str += "0"
-            else:
-                raise ValueError("The input matrix 'data' should be binary.")
+    binary_matrix = _unpack_if_needed(binary_matrix)
+
+    if binary_matrix.ndim != 2:
+        raise ValueError(
+            "The input matrix 'data' should have shape (n_channels, n_times).")
+
+    if np.any((binary_matrix != 0) & (binary_matrix != 1)):
+        raise ValueError("The input matrix 'data' should be binary.")
+
+    # the bytes 0 and 1 are shifted to the characters '0' and '1'
+    binary_buffer = binary_matrix.ravel(order="F").astype(np.uint8)
+    binary_buffer += ord("0")
 
-    return binary_str
+    return binary_buffer.tobytes().decode("ascii")
 
 
 def map_matrix_to_integer(binary_matrix):
     """Map each binary column of binary matrix onto an integer.
 
+    The row i of the matrix is the bit i of the integer. For more than 64
+    rows, the integers don't fit in 64 bits, so each column is mapped to
+    its packed bits viewed as a fixed-width bytes (void) value. These
+    values can still be compared, sorted and counted, e.g. with
+    compute_entropy.
+
     Parameters
     ----------
-    binary_matrix : ndarray, shape (n_rows, n_columns)
-        Data matrix with binary values.
+    binary_matrix : ndarray or PackedBinaryMatrix, shape (n_rows, n_columns)
+        Data matrix with binary values. Leading axes, e.g. epochs, are kept,
+        i.e. (..., n_rows, n_columns).
 
     Returns
     -------
-    ndarray, shape (1,n_columns)
-        Array with integers.
+    ndarray, shape (..., n_columns)
+        Array with integers (int64, uint64 for 64 rows), or with void values
+        of ceil(n_rows / 8) bytes for more than 64 rows.
     """
-    if not isinstance(binary_matrix, np.ndarray):
+    if not isinstance(binary_matrix, (np.ndarray, PackedBinaryMatrix)):
         raise TypeError("The input matrix 'data' should be ndarray.")
 
-    n_rows, n_cols = np.shape(binary_matrix)
-    col_map = np.zeros(n_cols, dtype=int)
-    for col_idx in range(n_cols):
-        for row_idx in range(n_rows):
-            if (binary_matrix[row_idx, col_idx] == 0
-                    or binary_matrix[row_idx, col_idx] == 1):
-                col_map[col_idx] = col_map[col_idx] + \
-                    binary_matrix[row_idx, col_idx] * (2**row_idx)
-            else:
-                raise ValueError("The input matrix 'data' should be binary.")
+    start_stage = _start_stage()
+    binary_matrix = _unpack_if_needed(binary_matrix)
+
+    if np.any((binary_matrix != 0) & (binary_matrix != 1)):
+        raise ValueError("The input matrix 'data' should be binary.")
+
+    n_rows = binary_matrix.shape[-2]
+    kernels = _get_kernels()
+    if n_rows <= 64 and kernels is not None:
+        # one pass over the bits of each column
+        dtype = np.int64 if n_rows < 64 else np.uint64
+        *leading_shape, _, n_columns = binary_matrix.shape
+        matrices = binary_matrix.reshape((-1,) + binary_matrix.shape[-2:])
+        col_map = np.empty((matrices.shape[0], n_columns), dtype=dtype)
+        kernels.column_codes(matrices, col_map)
+        col_map = col_map.reshape((*leading_shape, n_columns))
+    elif n_rows <= 64:
+        # dot product with the powers of two
+        dtype = np.int64 if n_rows < 64 else np.uint64
+        powers = np.left_shift(1, np.arange(n_rows, dtype=dtype), dtype=dtype)
+        col_map = np.matmul(powers, binary_matrix.astype(dtype, copy=False))
+    else:
+        # pack the bits of each column into contiguous bytes
+        packed = np.packbits(
+            binary_matrix.astype(bool, copy=False), axis=-2,
+            bitorder="little")
+        packed = np.ascontiguousarray(np.swapaxes(packed, -1, -2))
+        col_map = packed.view(np.dtype((np.void, packed.shape[-1])))[..., 0]
+
+    _end_stage("column_coding", start_stage, col_map)
 
     return col_map
 
@@ -145,61 +407,201 @@ def _compute_synchrony(p1, p2, threshold=0.8):
         raise ValueError(
             "The parameters p1 and p2 don't have the same length.")
 
-    differences = np.array(abs(p1 - p2))
-    sync_time_series = np.zeros(len(differences), dtype=np.int8)
-    for i, difference in enumerate(differences):
-        # center the difference between 0 and pi
-        if difference > np.pi:
-            difference = 2 * np.pi - difference
+    # center the differences between 0 and pi
+    differences = np.abs(p1 - p2)
+    differences = np.where(
+        differences > np.pi, 2 * np.pi - differences, differences)
 
-        if difference < threshold:
-            # the time series are synchronized
-            sync_time_series[i] = 1
+    # the time series are synchronized below the threshold
+    sync_time_series = (differences < threshold).astype(np.int8)
 
     return sync_time_series
 
 
-def compute_synchrony_matrix(data, threshold=0.8):
+def compute_synchrony_matrix(data, threshold=0.8, packed=False,
+                             dtype=np.float64, pad=False, workers=None):
     """Compute binary synchrony matrix.
 
     Parameters
     ----------
     data : ndarray, shape (n_channels, n_times)
-        Multidimensional time series matrix.
+        Multidimensional time series matrix. Leading axes, e.g. epochs, are
+        kept, i.e. (..., n_channels, n_times).
     threshold : float, optional (default 0.8)
         Threshold to define "synchronized" (1) and "not synchronized" (0).
+    packed : bool, optional (default False)
+        If True, returns the synchrony matrix as PackedBinaryMatrix. The
+        full int8 matrix is never allocated.
+    dtype : data-type | None, optional (default np.float64)
+        Precision of the Hilbert transform, np.float64 (complex128) or
+        np.float32 (complex64). If None, the precision of the input is kept.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        for the Hilbert transform, which is faster for lengths with large
+        prime factors but changes the values slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs of the Hilbert transform.
+        If -1, it is set to the number of CPU cores.
 
     Returns
     -------
-    ndarray, shape (n_channels, n_channels - 1, n_times)
-        Synchrony matrix.
+    ndarray or PackedBinaryMatrix
+        Synchrony matrix, shape (..., n_channels, n_channels - 1, n_times).
     """
     if not isinstance(data, np.ndarray):
         raise TypeError("The input matrix 'data' should be ndarray.")
 
-    # get phase time series from Hilbert transform
-    phases_matrix = np.angle(signal.hilbert(data))
-    n_channels, n_times = np.shape(phases_matrix)
-    synch_matrix = np.zeros(
-        shape=(n_channels, n_channels - 1, n_times),
-        dtype=np.int8
-    )
-    for i in range(n_channels):
-        k = 0
-        for j in range(n_channels):
-            # ignore the same channel
-            if i != j:
-                synch_matrix[i, k] = _compute_synchrony(
-                    phases_matrix[i],
-                    phases_matrix[j],
-                    threshold=threshold
-                )
-                k += 1
+    data = data.astype(_check_dtype(data, dtype), copy=False)
+
+    # get analytic signal from Hilbert transform
+    analytic_signal = _analytic_signal(data, pad=pad, workers=workers)
+
+    return _synchrony_from_analytic(
+        analytic_signal, threshold=threshold, packed=packed)
+
+
+def _synchrony_from_analytic(analytic_signal, threshold=0.8, packed=False):
+    """Compute binary synchrony matrix from the analytic signal.
+
+    The phase difference of channels i and j is below the threshold if
+    Re(z_i * conj(z_j)) > cos(threshold) * |z_i| * |z_j|, with z the
+    analytic signal, so the phases are not needed. Synchrony is symmetric,
+    so each pair of channels is computed once.
+
+    Parameters
+    ----------
+    analytic_signal : ndarray, shape (..., n_channels, n_times)
+        Analytic signal of the time series.
+    threshold : float, optional (default 0.8)
+        Threshold to define "synchronized" (1) and "not synchronized" (0).
+        Values above pi are clipped to pi.
+    packed : bool, optional (default False)
+        If True, returns the synchrony matrix as PackedBinaryMatrix.
+
+    Returns
+    -------
+    ndarray or PackedBinaryMatrix
+        Synchrony matrix, shape (..., n_channels, n_channels - 1, n_times).
+    """
+    start_stage = _start_stage()
+    *leading_shape, n_channels, n_times = np.shape(analytic_signal)
+    if packed:
+        synch_matrix = np.zeros(
+            shape=(*leading_shape, n_channels, n_channels - 1,
+                   (n_times + 7) // 8),
+            dtype=np.uint8
+        )
+    else:
+        synch_matrix = np.zeros(
+            shape=(*leading_shape, n_channels, n_channels - 1, n_times),
+            dtype=np.int8
+        )
+
+    real = analytic_signal.real
+    imag = analytic_signal.imag
+    amplitude = np.abs(analytic_signal)
+    scaled_amplitude = np.cos(min(threshold, np.pi)) * amplitude
+
+    kernels = _get_kernels()
+    if kernels is not None:
+        # fill the matrix of each epoch without temporary arrays
+        shape = (-1, n_channels, n_times)
+        real, imag = real.reshape(shape), imag.reshape(shape)
+        amplitude = amplitude.reshape(shape)
+        scaled_amplitude = scaled_amplitude.reshape(shape)
+        out = synch_matrix.view(np.uint8).reshape(
+            (-1,) + synch_matrix.shape[-3:])
+        for idx in range(out.shape[0]):
+            kernels.synchrony_matrix(
+                real[idx], imag[idx], scaled_amplitude[idx], amplitude[idx],
+                out[idx], packed)
+    else:
+        for i in range(n_channels - 1):
+            # synchrony of channel i with the channels j > i
+            pair_synch = (
+                real[..., i:i + 1, :] * real[..., i + 1:, :]
+                + imag[..., i:i + 1, :] * imag[..., i + 1:, :]
+            ) > scaled_amplitude[..., i:i + 1, :] * amplitude[..., i + 1:, :]
+            if packed:
+                pair_synch = np.packbits(pair_synch, axis=-1)
+
+            # row j - 1 of channel i and row i of channel j
+            synch_matrix[..., i, i:, :] = pair_synch
+            synch_matrix[..., i + 1:, i, :] = pair_synch
+
+    if packed:
+        synch_matrix = PackedBinaryMatrix(synch_matrix, n_times)
+
+    _end_stage("synchrony", start_stage, synch_matrix)
 
     return synch_matrix
 
 
-def create_random_binary_matrix(n_rows, n_columns):
+def _channel_synchrony_from_analytic(analytic_signal, ch_idx, threshold=0.8):
+    """Compute the synchrony of one channel with the other channels.
+
+    Same as _synchrony_from_analytic(analytic_signal)[..., ch_idx, :, :]
+    (with the same rounding), without computing the other pairs.
+
+    Parameters
+    ----------
+    analytic_signal : ndarray, shape (..., n_channels, n_times)
+        Analytic signal of the time series.
+    ch_idx : int
+        Index of the channel.
+    threshold : float, optional (default 0.8)
+        Threshold to define "synchronized" (1) and "not synchronized" (0).
+        Values above pi are clipped to pi.
+
+    Returns
+    -------
+    ndarray of int8, shape (..., n_channels - 1, n_times)
+        Synchrony of the channel with the other channels, in channel order.
+    """
+    start_stage = _start_stage()
+    *leading_shape, n_channels, n_times = np.shape(analytic_signal)
+    real = analytic_signal.real
+    imag = analytic_signal.imag
+    amplitude = np.abs(analytic_signal)
+    cos_threshold = np.cos(min(threshold, np.pi))
+    synch_matrix = np.empty(
+        (*leading_shape, n_channels - 1, n_times), dtype=np.int8)
+
+    kernels = _get_kernels()
+    if kernels is not None:
+        # fill the rows of each epoch without temporary arrays
+        shape = (-1, n_channels, n_times)
+        real, imag = real.reshape(shape), imag.reshape(shape)
+        scaled_amplitude = (cos_threshold * amplitude).reshape(shape)
+        amplitude = amplitude.reshape(shape)
+        out = synch_matrix.reshape((-1, n_channels - 1, n_times))
+        for idx in range(out.shape[0]):
+            kernels.channel_synchrony(
+                real[idx], imag[idx], scaled_amplitude[idx], amplitude[idx],
+                ch_idx, out[idx])
+    else:
+        # the amplitude of the lower channel of each pair is scaled
+        ch = slice(ch_idx, ch_idx + 1)
+        np.greater(
+            real[..., :ch_idx, :] * real[..., ch, :]
+            + imag[..., :ch_idx, :] * imag[..., ch, :],
+            (cos_threshold * amplitude[..., :ch_idx, :])
+            * amplitude[..., ch, :],
+            out=synch_matrix[..., :ch_idx, :], casting="unsafe")
+        np.greater(
+            real[..., ch, :] * real[..., ch_idx + 1:, :]
+            + imag[..., ch, :] * imag[..., ch_idx + 1:, :],
+            (cos_threshold * amplitude[..., ch, :])
+            * amplitude[..., ch_idx + 1:, :],
+            out=synch_matrix[..., ch_idx:, :], casting="unsafe")
+
+    _end_stage("synchrony", start_stage, synch_matrix)
+
+    return synch_matrix
+
+
+def create_random_binary_matrix(n_rows, n_columns, packed=False,
+                                random_state=None):
     """Create a random binary matrix with uniform distribution.
 
     Parameters
@@ -208,22 +610,28 @@ def create_random_binary_matrix(n_rows, n_columns):
         Number of rows.
     n_columns : int
         Number of colums
+    packed : bool, optional (default False)
+        If True, returns the random matrix as PackedBinaryMatrix.
+    random_state : None | int | instance of SeedSequence or Generator
+        Seed passed to numpy.random.default_rng. If None (default), the
+        global numpy random state is used.
 
     Returns
     -------
-    ndarray, shape (n_rows, n_columns)
+    ndarray or PackedBinaryMatrix, shape (n_rows, n_columns)
         Random binary matrix.
     """
-    if not isinstance(n_rows, int) or not isinstance(n_rows, int):
+    if not isinstance(n_rows, int) or not isinstance(n_columns, int):
         raise TypeError("The number of rows and columns must be integer.")
 
-    binary_matrix = np.random.rand(n_rows, n_columns)
-    for i in range(n_rows):
-        for j in range(n_columns):
-            if binary_matrix[i, j] > 0.5:
-                binary_matrix[i, j] = 1
-            else:
-                binary_matrix[i, j] = 0
+    if random_state is None:
+        binary_matrix = np.random.rand(n_rows, n_columns)
+    else:
+        rng = np.random.default_rng(random_state)
+        binary_matrix = rng.random((n_rows, n_columns))
+
+    binary_matrix = (binary_matrix > 0.5).astype('int8')
+    if packed:
+        return pack_binary_matrix(binary_matrix)
 
-    binary_matrix = binary_matrix.astype('int8')
     return binary_matrix
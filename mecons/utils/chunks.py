@@ -0,0 +1,165 @@
+"""Useful functions for processing data chunk by chunk."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+
+def _is_mne_data(data):
+    """Return True if data is a MNE Raw or Epochs object.
+
+    Duck typing is used, so mne is not imported.
+    """
+    return hasattr(data, "get_data") and hasattr(data, "info")
+
+
+def _is_mne_epochs(data):
+    """Return True if data is a MNE Epochs object."""
+    return _is_mne_data(data) and hasattr(data, "events")
+
+
+def _is_lazy(data):
+    """Return True if the data is not loaded in memory."""
+    return isinstance(data, np.memmap) or _is_mne_data(data)
+
+
+def _epochs_shape(data):
+    """Return the shape (n_epochs, n_channels, n_times) of epoched data."""
+    if _is_mne_epochs(data):
+        return len(data), len(data.ch_names), len(data.times)
+
+    return data.shape
+
+
+def _drop_bad_epochs(epochs):
+    """Return the epochs without the bad ones, leaving the input unchanged.
+
+    Epochs.drop_bad works in place, so Epochs not loaded are copied first
+    (the copy doesn't hold any data). Loaded Epochs and readers have no bad
+    epochs left.
+
+    Parameters
+    ----------
+    epochs : instance of Epochs or _EpochsReader
+        Epochs, possibly with preload=False.
+
+    Returns
+    -------
+    instance of Epochs or _EpochsReader
+        Epochs without the bad ones.
+    """
+    if isinstance(epochs, _EpochsReader) or getattr(epochs, "preload", False):
+        return epochs
+
+    return epochs.copy().drop_bad()
+
+
+def _get_epochs(data, start, stop):
+    """Load the epochs from start to stop of epoched data.
+
+    Parameters
+    ----------
+    data : ndarray or PackedBinaryMatrix or instance of Epochs
+        Data with epochs along the first axis.
+    start : int
+        First epoch.
+    stop : int
+        Epoch after the last one.
+
+    Returns
+    -------
+    ndarray or PackedBinaryMatrix, shape (stop - start, n_channels, n_times)
+        Epochs. Slices of np.memmap are read when they are used.
+    """
+    if _is_mne_epochs(data):
+        return data.get_data(item=slice(start, stop))
+
+    return data[start:stop]
+
+
+def iter_epochs(data, batch_size=1):
+    """Iterate over batches of epochs, loading one batch at a time.
+
+    Parameters
+    ----------
+    data : ndarray or instance of Epochs, shape (n_epochs, n_channels, n_times)
+        Epoched data, e.g. np.memmap or Epochs with preload=False.
+    batch_size : int, optional (default 1)
+        Number of epochs per batch.
+
+    Yields
+    ------
+    ndarray, shape (batch_size, n_channels, n_times)
+        Batch of epochs. The last batch can be shorter.
+    """
+    if not (isinstance(data, np.ndarray) or _is_mne_epochs(data)):
+        raise TypeError("Data should be a ndarray or a MNE Epochs object.")
+
+    if not isinstance(batch_size, (int, np.integer)) or batch_size < 1:
+        raise ValueError("The parameter batch_size should be a positive "
+                         "integer.")
+
+    n_epochs = _epochs_shape(data)[0]
+    for start in range(0, n_epochs, batch_size):
+        yield _get_epochs(data, start, min(start + batch_size, n_epochs))
+
+
+class _EpochsReader:
+    """Read a channel and time selection of MNE Epochs, one chunk at a time.
+
+    MNE Epochs opened with preload=False can't be picked or cropped without
+    loading them, so the selection is applied when each chunk is read. The
+    reader behaves as Epochs for the functions of this module.
+
+    Parameters
+    ----------
+    epochs : instance of Epochs
+        Epochs, possibly with preload=False. The bad epochs are dropped
+        (from a copy, see _drop_bad_epochs).
+    picks : list of int | None
+        Indices of the channels to read. If None, all channels.
+    tmin : float | None
+        Start time of the data to read. If None, the start of the epochs.
+    tmax : float | None
+        End time of the data to read. If None, the end of the epochs.
+    """
+
+    def __init__(self, epochs, picks=None, tmin=None, tmax=None):
+        self.epochs = _drop_bad_epochs(epochs)
+        self.picks = picks
+        self.tmin = tmin
+        self.tmax = tmax
+        # read one epoch to know the number of samples of the selection
+        self._shape = self.get_data(item=slice(0, 1)).shape[1:]
+
+    @property
+    def info(self):
+        """Measurement info of the epochs."""
+        return self.epochs.info
+
+    @property
+    def events(self):
+        """Events of the epochs."""
+        return self.epochs.events
+
+    @property
+    def ch_names(self):
+        """Names of the selected channels."""
+        if self.picks is None:
+            return self.epochs.ch_names
+        return [self.epochs.ch_names[pick] for pick in self.picks]
+
+    @property
+    def times(self):
+        """Times of the selected samples."""
+        start = self.epochs.times[0] if self.tmin is None else self.tmin
+        return start + np.arange(self._shape[1]) / self.info["sfreq"]
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def get_data(self, item=None):
+        """Read the selection of the epochs given by item."""
+        return self.epochs.get_data(
+            picks=self.picks, item=item, tmin=self.tmin, tmax=self.tmax)
@@ -0,0 +1,122 @@
+"""Useful functions for running computations in parallel over epochs."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import numpy as np
+
+from . import backend
+from .chunks import _epochs_shape, _get_epochs, _is_lazy, _is_mne_data
+
+
+def _get_epoch_seeds(random_state, n_epochs):
+    """Create one independent seed per epoch.
+
+    Each epoch gets its own seed, so the results don't depend on how the
+    epochs are split across jobs.
+
+    Parameters
+    ----------
+    random_state : None | int | instance of Generator
+        Random state. If None, the seed is drawn from the global numpy random
+        state, so np.random.seed can still be used for reproducibility.
+    n_epochs : int
+        Number of epochs.
+
+    Returns
+    -------
+    root_seed : instance of SeedSequence
+        Seed from which the epoch seeds were spawned.
+    epoch_seeds : list of SeedSequence
+        Seed per epoch.
+    """
+    if random_state is None:
+        random_state = np.random.randint(np.iinfo(np.int32).max)
+    elif isinstance(random_state, np.random.Generator):
+        random_state = int(random_state.integers(np.iinfo(np.int64).max))
+    elif not isinstance(random_state, (int, np.integer)):
+        raise TypeError(
+            "The parameter random_state should be None, an integer or "
+            "a numpy Generator.")
+
+    root_seed = np.random.SeedSequence(int(random_state))
+    epoch_seeds = root_seed.spawn(n_epochs)
+
+    return root_seed, epoch_seeds
+
+
+def _parallel_over_epochs(func, data, epoch_seeds, n_jobs=1, batch_size=None,
+                          **kwargs):
+    """Run a function over chunks of epochs in parallel.
+
+    The epochs are split in contiguous chunks, at least one per job, so each
+    chunk of data is sent to the workers only once. The results are returned
+    in the order of the epochs.
+
+    Parameters
+    ----------
+    func : callable
+        Function with signature ``func(data, epoch_seeds, **kwargs)``
+        returning an ndarray, or a tuple of ndarrays, with the epochs along
+        the first axis.
+    data : ndarray or PackedBinaryMatrix or instance of Epochs
+        Data with epochs along the first axis. MNE Epochs are loaded chunk by
+        chunk.
+    epoch_seeds : list of SeedSequence
+        Seed per epoch.
+    n_jobs : int | None, optional (default 1)
+        The number of jobs to run in parallel. If -1, it is set to the
+        number of CPU cores.
+    batch_size : int | None, optional (default None)
+        Maximum number of epochs per chunk. If None, np.memmap and MNE
+        Epochs are processed one epoch at a time, and other data in one
+        chunk per job.
+    **kwargs : dict
+        Extra keyword arguments passed to func.
+
+    Returns
+    -------
+    ndarray or tuple of ndarray
+        Concatenated results of all epochs.
+    """
+    n_epochs = _epochs_shape(data)[0]
+    if batch_size is None:
+        batch_size = 1 if _is_lazy(data) else n_epochs
+    elif not isinstance(batch_size, (int, np.integer)) or batch_size < 1:
+        raise ValueError("The parameter batch_size should be a positive "
+                         "integer.")
+    n_chunks = -(-n_epochs // batch_size)
+
+    if n_jobs == 1 or n_epochs == 1:
+        if n_chunks == 1 and not _is_mne_data(data):
+            return func(data, epoch_seeds, **kwargs)
+        parallel, p_fun, func_args = list, func, ()
+    else:
+        from mne.parallel import parallel_func
+
+        # the workers use the same backend as the main process
+        parallel, p_fun, n_jobs = parallel_func(
+            _run_with_backend, n_jobs, max_jobs=n_epochs)
+        func_args = (func, backend._backend)
+        n_chunks = max(n_chunks, n_jobs)
+
+    # the chunks are read sequentially, one at a time if serial
+    chunks = np.array_split(np.arange(n_epochs), n_chunks)
+    results = parallel(
+        p_fun(*func_args, _get_epochs(data, chunk[0], chunk[-1] + 1),
+              epoch_seeds[chunk[0]:chunk[-1] + 1],
+              **kwargs)
+        for chunk in chunks
+    )
+
+    if isinstance(results[0], tuple):
+        return tuple(np.concatenate(result) for result in zip(*results))
+
+    return np.concatenate(results)
+
+
+def _run_with_backend(func, backend_name, *args, **kwargs):
+    """Run a function in a worker with the backend of the main process."""
+    backend.set_backend(backend_name)
+
+    return func(*args, **kwargs)
@@ -7,31 +7,186 @@
 # License : BSD-3-Clause
 
 import numpy as np
-from scipy import signal
+from scipy import fft as sp_fft
 
+from .chunks import _drop_bad_epochs, _is_mne_data, _is_mne_epochs
+from .profiling import _start_stage, _end_stage
 
-def detrending_normalization(data):
+# maximum number of values of the temporary arrays used for detrending
+_DETREND_BLOCK_VALUES = 2 ** 18
+
+
+def detrending_normalization(data, dtype=np.float64, out=None,
+                             overwrite_input=False):
     """Detrend and subtract the mean on input data.
 
+    The least-squares line of each channel is removed in closed form for
+    all channels at once.
+
     Parameters
     ----------
     data : ndarray, shape (n_channels, n_times)
-        Multidimensional time series matrix.
+        Multidimensional time series matrix. Leading axes, e.g. epochs, are
+        kept, i.e. (..., n_channels, n_times).
+    dtype : data-type | None, optional (default np.float64)
+        Floating point precision of the output, np.float64 or np.float32.
+        If None, the precision of the input is kept (float64 for integer
+        inputs).
+    out : ndarray | None, optional (default None)
+        Array where the result is written, with the same shape as data and
+        the output dtype. It can be reused between calls to avoid
+        allocating a new matrix.
+    overwrite_input : bool, optional (default False)
+        If True and data already has the output dtype, the result is
+        written in data. Ignored if out is given.
 
     Returns
     -------
-    ndarray, shape (n_channels, n_times)
+    ndarray, shape (..., n_channels, n_times)
         Data matrix after detrending and subtracting the mean.
     """
     if not isinstance(data, np.ndarray):
         raise TypeError("The input matrix 'data' should be ndarray.")
 
-    n_channels, n_times = np.shape(data)
-    data_processed = np.zeros((n_channels, n_times))
+    dtype = _check_dtype(data, dtype)
+    start_stage = _start_stage()
+
+    if out is not None:
+        if not isinstance(out, np.ndarray):
+            raise TypeError("The output 'out' should be ndarray.")
+        if out.shape != data.shape or out.dtype != dtype:
+            raise ValueError(
+                "The output 'out' should have the shape of data and dtype %s."
+                % dtype)
+        if out is not data:
+            out[...] = data
+    elif (overwrite_input and data.dtype == dtype
+            and data.flags.writeable):
+        out = data
+    else:
+        out = data.astype(dtype)
+
+    # least-squares line with centered times: the offset is the mean
+    n_times = out.shape[-1]
+    times = np.arange(n_times, dtype=dtype) - (n_times - 1) / 2
+    out -= np.mean(out, axis=-1, keepdims=True)
+    if n_times > 1:
+        slope = (out @ times) / (times @ times)
+        # remove the line in blocks of samples, so the temporary products
+        # stay small
+        block_size = max(1, _DETREND_BLOCK_VALUES // max(slope.size, 1))
+        for start in range(0, n_times, block_size):
+            stop = min(start + block_size, n_times)
+            out[..., start:stop] -= slope[..., np.newaxis] * times[start:stop]
+
+    _end_stage("detrending", start_stage, out)
+
+    return out
+
+
+def _analytic_signal(data, pad=False, workers=None):
+    """Compute the analytic signal along the last axis.
+
+    Same as scipy.signal.hilbert, but the spectrum is computed with a
+    real-input FFT and the transforms can use several threads.
+
+    Parameters
+    ----------
+    data : ndarray of float, shape (..., n_times)
+        Real time series. float32 data gives a complex64 analytic signal.
+    pad : bool, optional (default False)
+        If True, the time series are zero-padded to the next fast FFT length
+        (see scipy.fft.next_fast_len), and the analytic signal is trimmed
+        back to n_times. It speeds up lengths with large prime factors, but
+        the values change slightly at the edges.
+    workers : int | None, optional (default None)
+        Maximum number of threads used by the FFTs. If None, one thread
+        (see scipy.fft).
+
+    Returns
+    -------
+    ndarray of complex, shape (..., n_times)
+        Analytic signal.
+    """
+    start_stage = _start_stage()
+    n_times = data.shape[-1]
+    n_fft = sp_fft.next_fast_len(n_times, real=True) if pad else n_times
+
+    # one-sided spectrum with the positive frequencies doubled
+    spectrum = sp_fft.rfft(data, n_fft, axis=-1, workers=workers)
+    spectrum[..., 1:(n_fft + 1) // 2] *= 2
+
+    # negative frequencies are zero
+    full_spectrum = np.zeros(
+        data.shape[:-1] + (n_fft,), dtype=spectrum.dtype)
+    full_spectrum[..., :spectrum.shape[-1]] = spectrum
+    analytic_signal = sp_fft.ifft(
+        full_spectrum, axis=-1, overwrite_x=True, workers=workers)
+    analytic_signal = analytic_signal[..., :n_times]
+
+    _end_stage("hilbert", start_stage, analytic_signal)
+
+    return analytic_signal
+
+
+def _check_dtype(data, dtype):
+    """Return the floating point dtype used to process the data.
+
+    Parameters
+    ----------
+    data : ndarray
+        Input data.
+    dtype : data-type | None
+        np.float64 or np.float32. If None, the dtype of data if it is
+        floating point, np.float64 otherwise.
+
+    Returns
+    -------
+    dtype
+        Floating point dtype.
+    """
+    if dtype is None:
+        if data.dtype in (np.float32, np.float64):
+            return data.dtype
+        return np.dtype(np.float64)
+
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError(
+            "The parameter dtype should be np.float64, np.float32 or None.")
+
+    return np.dtype(dtype)
+
+
+def _add_epochs_axis(data):
+    """Return the data with shape (n_epochs, n_channels, n_times).
+
+    MNE Epochs are kept lazy, with the bad epochs dropped so their number is
+    known (the input Epochs are not modified). MNE Raw objects are loaded as
+    one (n_channels, n_times) matrix.
+
+    Parameters
+    ----------
+    data : ndarray or PackedBinaryMatrix or instance of Raw or Epochs
+        Data with shape (n_channels, n_times) or
+        (n_epochs, n_channels, n_times).
+
+    Returns
+    -------
+    data : ndarray or PackedBinaryMatrix or instance of Epochs
+        Data with epochs axis, i.e. shape (n_epochs, n_channels, n_times).
+    is_epoched : bool
+        True if the input data already had an epochs axis.
+    """
+    if _is_mne_epochs(data):
+        return _drop_bad_epochs(data), True
+    elif _is_mne_data(data):
+        return data.get_data()[np.newaxis], False
 
-    for ch_idx in range(n_channels):
-        data_processed[ch_idx, :] = signal.detrend(
-            data[ch_idx, :] - np.mean(data[ch_idx, :]), axis=0
-        )
+    if data.ndim == 2:
+        return data[np.newaxis], False
+    elif data.ndim == 3:
+        return data, True
 
-    return data_processed
+    raise ValueError(
+        "Data matrix should have shape (n_channels, n_times) "
+        "or (n_epochs, n_channels, n_times).")
@@ -0,0 +1,225 @@
+"""Useful functions for profiling the stages of the metrics."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# License : BSD-3-Clause
+
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+# profiler recording the stages, None if profiling is disabled
+_active_profiler = None
+
+
+class Profiler:
+    """Record wall time, bytes and shapes of each stage of the metrics.
+
+    While the profiler is active (inside a with block), the stages of the
+    metrics, e.g. 'detrending', 'hilbert', 'binarization', 'synchrony',
+    'column_coding', 'entropy', 'lzw' (or 'lz76') and 'surrogates', are
+    recorded every time they run, so the records of many epochs are
+    aggregated. When no profiler is active, each stage only checks a global
+    variable.
+
+    Note: Only the stages run in the current process are recorded, i.e.
+    with n_jobs=1. The 'surrogates' stage includes the column coding,
+    entropy and LZW stages of the normalization.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional (default False)
+        If True, the peak memory allocated in each stage (above the memory
+        already allocated when it starts, including its inner stages) is
+        traced with tracemalloc, which slows down the computations. If
+        False, only the size of the output of each stage is recorded.
+    callback : callable | None, optional (default None)
+        Function called after each stage with signature
+        ``callback(stage, record)``, where record is a dict with the keys
+        'time', 'nbytes', 'peak_bytes' and 'shape'.
+
+    Examples
+    --------
+    >>> with Profiler() as profiler:  # doctest: +SKIP
+    ...     lempel_ziv_complexity(data)
+    >>> profiler.to_dict()  # doctest: +SKIP
+    """
+
+    def __init__(self, trace_memory=False, callback=None):
+        if callback is not None and not callable(callback):
+            raise TypeError("The callback should be callable.")
+
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self.records = dict()
+        # traced memory of the stages that are running, outermost first
+        self._open_stages = list()
+        self._previous = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        global _active_profiler
+
+        self._previous = _active_profiler
+        _active_profiler = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        return self
+
+    def __exit__(self, *args):
+        global _active_profiler
+
+        _active_profiler = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _record(self, stage, elapsed, result, peak_bytes):
+        """Add the record of one run of a stage."""
+        record = dict(time=elapsed, nbytes=_nbytes(result),
+                      peak_bytes=peak_bytes, shape=_shape(result))
+        self.records.setdefault(stage, list()).append(record)
+        if self.callback is not None:
+            self.callback(stage, record)
+
+    def to_dict(self):
+        """Aggregate the records of each stage.
+
+        Returns
+        -------
+        dict
+            Summary per stage, with the number of calls ('n_calls'), the
+            total, mean and maximum wall time in seconds ('total_time',
+            'mean_time', 'max_time'), the total size of the outputs in bytes
+            ('total_bytes'), the maximum peak memory in bytes ('peak_bytes',
+            None if not traced) and the distinct output shapes ('shapes').
+        """
+        summary = dict()
+        for stage, records in self.records.items():
+            times = np.array([record["time"] for record in records])
+            peaks = [record["peak_bytes"] for record in records
+                     if record["peak_bytes"] is not None]
+            shapes = list()
+            for record in records:
+                if record["shape"] not in shapes:
+                    shapes.append(record["shape"])
+
+            summary[stage] = dict(
+                n_calls=len(records),
+                total_time=float(times.sum()),
+                mean_time=float(times.mean()),
+                max_time=float(times.max()),
+                total_bytes=int(sum(record["nbytes"] for record in records)),
+                peak_bytes=int(max(peaks)) if peaks else None,
+                shapes=shapes
+            )
+
+        return summary
+
+    def to_json(self, fname=None):
+        """Export the aggregated records as JSON.
+
+        Parameters
+        ----------
+        fname : str | None, optional (default None)
+            If str, the JSON is also written to this file.
+
+        Returns
+        -------
+        str
+            Aggregated records (see to_dict) as JSON.
+        """
+        json_str = json.dumps(self.to_dict(), indent=4)
+        if fname is not None:
+            with open(fname, "w") as fid:
+                fid.write(json_str)
+
+        return json_str
+
+    def reset(self):
+        """Remove all records."""
+        self.records = dict()
+        self._open_stages = list()
+
+
+def _start_stage():
+    """Return the start of a stage, None if profiling is disabled.
+
+    The stages can be nested, e.g. 'column_coding' inside 'surrogates'. The
+    peak of tracemalloc is reset when a stage starts, so the peak reached
+    so far is first kept in every enclosing stage.
+
+    Returns
+    -------
+    tuple | None
+        Start time and traced memory of the stage (None if not traced).
+    """
+    if _active_profiler is None:
+        return None
+
+    open_stage = None
+    if _active_profiler.trace_memory and tracemalloc.is_tracing():
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        for enclosing_stage in _active_profiler._open_stages:
+            enclosing_stage["peak"] = max(enclosing_stage["peak"], peak_bytes)
+        if hasattr(tracemalloc, "reset_peak"):
+            # Python >= 3.9, otherwise the peak is since tracing started
+            tracemalloc.reset_peak()
+        open_stage = dict(start=current_bytes, peak=current_bytes)
+        _active_profiler._open_stages.append(open_stage)
+
+    return time.perf_counter(), open_stage
+
+
+def _end_stage(stage, start, result=None):
+    """Record a stage started with _start_stage, if profiling is enabled.
+
+    Parameters
+    ----------
+    stage : str
+        Name of the stage.
+    start : tuple | None
+        Value returned by _start_stage.
+    result : ndarray or PackedBinaryMatrix or tuple or None, optional
+        Output of the stage.
+    """
+    if start is None or _active_profiler is None:
+        return
+
+    start_time, open_stage = start
+    elapsed = time.perf_counter() - start_time
+    peak_bytes = None
+    if open_stage is not None:
+        # the peak since the last reset is not kept in the enclosing
+        # stages yet, so they still see it when they end
+        open_stages = _active_profiler._open_stages
+        for idx in range(len(open_stages) - 1, -1, -1):
+            if open_stages[idx] is open_stage:
+                del open_stages[idx]
+                break
+        if tracemalloc.is_tracing():
+            peak = max(open_stage["peak"], tracemalloc.get_traced_memory()[1])
+            peak_bytes = max(peak - open_stage["start"], 0)
+
+    _active_profiler._record(stage, elapsed, result, peak_bytes)
+
+
+def _nbytes(result):
+    """Return the number of bytes of the output of a stage."""
+    if isinstance(result, tuple):
+        return sum(_nbytes(value) for value in result)
+
+    return int(getattr(result, "nbytes", 0))
+
+
+def _shape(result):
+    """Return the shape of the output of a stage, as a list."""
+    if isinstance(result, tuple):
+        return [_shape(value) for value in result]
+
+    shape = getattr(result, "shape", None)
+
+    return list(shape) if shape is not None else None
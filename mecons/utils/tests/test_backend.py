@@ -0,0 +1,73 @@
+"""Tests for selecting the backend of the compiled kernels."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import numpy as np
+from numpy.random import default_rng
+import pytest
+
+from mecons.utils import backend
+from mecons.utils.backend import set_backend, get_backend
+from mecons.utils import compute_synchrony_matrix, map_matrix_to_integer
+from mecons.complexity import compute_metrics
+from mecons.complexity.compressibility import (
+    _lempel_ziv_welch_trie,
+    _lempel_ziv_76
+)
+
+
+def _compute_all(data, binary_matrix, sequences):
+    """Compute the outputs of all kernels."""
+    return dict(
+        metrics=compute_metrics(data, random_state=0, per_channel=True),
+        parallel_metrics=compute_metrics(data, random_state=0, n_jobs=2),
+        block_metrics=compute_metrics(
+            data, metrics="sce", random_state=0, per_channel=True,
+            memory_budget=2000),
+        synchrony=compute_synchrony_matrix(data),
+        packed_synchrony=compute_synchrony_matrix(data, packed=True).packed,
+        col_map=map_matrix_to_integer(binary_matrix),
+        col_map_64=map_matrix_to_integer(binary_matrix[:, :64]),
+        lzw=[_lempel_ziv_welch_trie(sequence) for sequence in sequences],
+        lz76=[_lempel_ziv_76(sequence) for sequence in sequences]
+    )
+
+
+def test_backends():
+    """Test that both backends give identical results."""
+    pytest.importorskip("numba")
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((2, 5, 301)).cumsum(axis=-1)
+    binary_matrix = (rgn.random((2, 70, 100)) > 0.5).astype(np.int8)
+    sequences = [(rgn.random(n_symbols) > 0.3).astype(np.uint8)
+                 for n_symbols in [1, 2, 10, 1000]]
+
+    previous_backend = backend._backend
+    try:
+        set_backend("numpy")
+        assert get_backend() == "numpy"
+        numpy_results = _compute_all(data, binary_matrix, sequences)
+        set_backend("numba")
+        assert get_backend() == "numba"
+        numba_results = _compute_all(data, binary_matrix, sequences)
+    finally:
+        set_backend(previous_backend)
+
+    for key, value in numpy_results.items():
+        if isinstance(value, dict):
+            for metric in value:
+                np.testing.assert_array_equal(
+                    value[metric], numba_results[key][metric])
+        else:
+            np.testing.assert_array_equal(value, numba_results[key])
+
+
+def test_set_backend():
+    """Test selecting the backend."""
+    # testing argument checker
+    with pytest.raises(ValueError) as exc_info:
+        set_backend("cython")
+    assert exc_info.type == ValueError
@@ -0,0 +1,54 @@
+"""Tests for caching normalization baselines."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import os
+import os.path as op
+
+import pytest
+
+from mecons.utils.baseline import (
+    set_cache_dir,
+    get_cache_dir,
+    clear_cache,
+    _cached_baseline,
+    _get_cache_seed
+)
+
+
+def test_cached_baseline(tmp_path):
+    """Test caching baselines in memory and on disk."""
+    # testing correct operation
+    calls = list()
+
+    def compute():
+        calls.append(1)
+        return 1.5
+
+    clear_cache()
+    set_cache_dir(None)
+    assert _cached_baseline("test", (2, 10, 0), compute) == 1.5
+    assert _cached_baseline("test", (2, 10, 0), compute) == 1.5
+    assert len(calls) == 1
+
+    set_cache_dir(str(tmp_path))
+    assert get_cache_dir() == str(tmp_path)
+    assert _cached_baseline("test", (3, 10, 0), compute) == 1.5
+    assert op.isfile(op.join(str(tmp_path), "test_baseline_3_10_0.npy"))
+    # the temporary file is renamed to the baseline file
+    assert os.listdir(str(tmp_path)) == ["test_baseline_3_10_0.npy"]
+    clear_cache()
+    assert _cached_baseline("test", (3, 10, 0), compute) == 1.5
+    assert len(calls) == 2
+    set_cache_dir(None)
+    clear_cache()
+
+    assert _get_cache_seed(3) == 3
+    assert _get_cache_seed(None) is None
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        set_cache_dir(1)
+    assert exc_info.type == TypeError
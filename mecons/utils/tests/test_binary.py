@@ -14,8 +14,14 @@ from mecons.utils.binary import (
     binarize_hilbert_amplitude,
     compute_synchrony_matrix,
     create_random_binary_matrix,
-    _compute_synchrony
+    pack_binary_matrix,
+    PackedBinaryMatrix,
+    _compute_synchrony,
+    _channel_synchrony_from_analytic,
+    _synchrony_from_analytic,
+    _window_thresholds
 )
+import mecons.utils.binary as binary
 
 
 def test_binarize_hilbert_amplitude():
@@ -48,6 +54,15 @@ def test_binarize_hilbert_amplitude():
 
         assert all(is_ok)
 
+    # median threshold per channel
+    medians = np.median(amplitudes, axis=1, keepdims=True)
+    binary_matrix = binarize_hilbert_amplitude(data, thr_method="median")
+    np.testing.assert_array_equal(
+        binary_matrix, (amplitudes >= medians).astype(np.int8))
+
+    # column-by-column concatenation is a view
+    assert np.shares_memory(binary_matrix.ravel(order="F"), binary_matrix)
+
     # testing argument checker
     data = [[]]
     with pytest.raises(TypeError) as exc_info:
@@ -64,6 +79,9 @@ def test_binary_matrix_to_string():
 
     assert data_processed == data_true_processed
 
+    data = np.array([[1, 1, 0], [0, 1, 1]], dtype=np.int8)
+    assert binary_matrix_to_string(data) == "101101"
+
     # testing argument checker
     data = [[]]
     with pytest.raises(TypeError) as exc_info:
@@ -90,6 +108,26 @@ def test_map_matrix_to_integer():
 
     np.testing.assert_array_equal(mapping, true_mapping)
 
+    # leading axes are kept
+    mapping = map_matrix_to_integer(np.array([binary_matrix, binary_matrix]))
+    np.testing.assert_array_equal(mapping, [true_mapping, true_mapping])
+
+    # 64 rows don't overflow
+    binary_matrix = np.zeros((64, 2), dtype=np.int8)
+    binary_matrix[63, 0] = 1
+    mapping = map_matrix_to_integer(binary_matrix)
+    np.testing.assert_array_equal(mapping, np.array([2**63, 0], np.uint64))
+
+    # more than 64 rows, columns differing only in high rows don't collide
+    binary_matrix = np.zeros((100, 3), dtype=np.int8)
+    binary_matrix[80, 0] = 1
+    binary_matrix[90, 1] = 1
+    binary_matrix[:, 2] = binary_matrix[:, 0]
+    mapping = map_matrix_to_integer(binary_matrix)
+    assert mapping[0] != mapping[1]
+    assert mapping[0] == mapping[2]
+    assert len(np.unique(mapping)) == 2
+
     # testing argument checker
     binary_matrix = [[]]
     with pytest.raises(TypeError) as exc_info:
@@ -176,6 +214,18 @@ def test_compute_synchrony_matrix():
         true_synchrony_matrix
     )
 
+    # same as comparing the phases of each pair of channels
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((4, n_points)).cumsum(axis=1)
+    phases = np.angle(hilbert(data))
+    data_processed = compute_synchrony_matrix(data)
+    for i in range(4):
+        others = [j for j in range(4) if j != i]
+        for k, j in enumerate(others):
+            np.testing.assert_array_equal(
+                data_processed[i, k], _compute_synchrony(phases[i], phases[j])
+            )
+
     # testing argument checker
     data = [[]]
     with pytest.raises(TypeError) as exc_info:
@@ -183,6 +233,24 @@ def test_compute_synchrony_matrix():
     assert exc_info.type == TypeError
 
 
+def test_channel_synchrony_from_analytic():
+    """Test the synchrony of one channel with the other channels."""
+    # testing correct operation
+    rng = np.random.default_rng(0)
+    analytic_signal = hilbert(
+        rng.standard_normal((2, 5, 300)).cumsum(axis=-1), axis=-1)
+    synch_matrix = _synchrony_from_analytic(analytic_signal)
+    for ch_idx in range(5):
+        np.testing.assert_array_equal(
+            _channel_synchrony_from_analytic(analytic_signal, ch_idx),
+            synch_matrix[:, ch_idx])
+        np.testing.assert_array_equal(
+            _channel_synchrony_from_analytic(
+                analytic_signal[0], ch_idx, threshold=0.3),
+            _synchrony_from_analytic(
+                analytic_signal[0], threshold=0.3)[ch_idx])
+
+
 def test_create_random_binary_matrix():
     """Test creating of random binary matrix."""
     # testing correct operation
@@ -201,3 +269,84 @@ def test_create_random_binary_matrix():
     with pytest.raises(TypeError) as exc_info:
         binary_matrix = create_random_binary_matrix(n_rows, n_columns)
     assert exc_info.type == TypeError
+
+
+def test_pack_binary_matrix():
+    """Test packing binary matrices into bits."""
+    # testing correct operation
+    rng = np.random.default_rng(0)
+    binary_matrix = rng.integers(0, 2, size=(3, 4, 21)).astype(np.int8)
+    packed = pack_binary_matrix(binary_matrix)
+
+    assert isinstance(packed, PackedBinaryMatrix)
+    assert packed.shape == binary_matrix.shape
+    assert packed.nbytes == 3 * 4 * 3
+    np.testing.assert_array_equal(packed.unpack(), binary_matrix)
+    np.testing.assert_array_equal(packed[1].unpack(), binary_matrix[1])
+    np.testing.assert_array_equal(
+        packed[np.array([0, 2])].unpack(), binary_matrix[[0, 2]])
+    np.testing.assert_array_equal(
+        packed[np.array([True, False, True]), 1:3].unpack(),
+        binary_matrix[[0, 2], 1:3])
+    np.testing.assert_array_equal(
+        map_matrix_to_integer(packed[2]), map_matrix_to_integer(
+            binary_matrix[2]))
+
+    # producers return the same values when packing
+    t = np.linspace(0, 1, 100)
+    data = np.array([np.sin(t*2*np.pi), np.cos(t*2*np.pi), t])
+    np.testing.assert_array_equal(
+        binarize_hilbert_amplitude(data, packed=True).unpack(),
+        binarize_hilbert_amplitude(data)
+    )
+    np.testing.assert_array_equal(
+        compute_synchrony_matrix(data, packed=True).unpack(),
+        compute_synchrony_matrix(data)
+    )
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        packed = pack_binary_matrix([[1, 0]])
+    assert exc_info.type == TypeError
+
+    with pytest.raises(ValueError) as exc_info:
+        packed = pack_binary_matrix(np.array([[1, 2, 1], [0, 1, 0]]))
+    assert exc_info.type == ValueError
+
+    with pytest.raises(IndexError) as exc_info:
+        packed[0, 0, 0]
+    assert exc_info.type == IndexError
+
+    with pytest.raises(IndexError) as exc_info:
+        packed[..., 0]
+    assert exc_info.type == IndexError
+
+
+def test_window_thresholds(monkeypatch):
+    """Test the binarization thresholds of sliding windows."""
+    # testing correct operation
+    rng = np.random.default_rng(0)
+    amplitude = np.abs(rng.standard_normal((3, 500)))
+    starts = range(0, 500 - 100 + 1, 30)
+    for thr_method, func in [("mean", np.mean), ("median", np.median)]:
+        true_thresholds = np.array([
+            func(amplitude[:, start:start + 100], axis=-1)
+            for start in starts
+        ]).T
+        np.testing.assert_allclose(
+            _window_thresholds(amplitude, 100, 30, thr_method=thr_method),
+            true_thresholds)
+
+    # the median windows are copied in chunks, e.g. two windows at a time
+    monkeypatch.setattr(
+        binary, "_WINDOW_CHUNK_BYTES", 2 * 3 * 100 * amplitude.itemsize)
+    np.testing.assert_allclose(
+        _window_thresholds(amplitude, 100, 30, thr_method="median"),
+        true_thresholds)
+    np.testing.assert_array_equal(amplitude, np.abs(
+        np.random.default_rng(0).standard_normal((3, 500))))
+
+    # testing argument checker
+    with pytest.raises(ValueError) as exc_info:
+        _window_thresholds(amplitude, 100, 30, thr_method="max")
+    assert exc_info.type == ValueError
@@ -0,0 +1,96 @@
+"""Tests for chunk by chunk processing."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import numpy as np
+from numpy.random import default_rng
+import pytest
+import mne
+
+from mecons.utils.chunks import iter_epochs
+from mecons.complexity import compute_metrics, lempel_ziv_complexity
+
+
+def _lazy_epochs(data, tmp_path, reject=None):
+    """Save continuous data and read it back as Epochs with preload=False."""
+    n_epochs, n_channels, n_times = data.shape
+    info = mne.create_info(n_channels, sfreq=100., ch_types="eeg")
+    raw = mne.io.RawArray(
+        np.concatenate(list(data), axis=-1), info, verbose=False)
+    fname = str(tmp_path / "test_raw.fif")
+    raw.save(fname, fmt="double", verbose=False)
+
+    raw = mne.io.read_raw_fif(fname, preload=False, verbose=False)
+    events = np.array([[epoch_idx * n_times, 0, 1]
+                       for epoch_idx in range(n_epochs)])
+    epochs = mne.Epochs(
+        raw, events, tmin=0, tmax=(n_times - 1) / raw.info["sfreq"],
+        baseline=None, reject=reject, preload=False, verbose=False)
+
+    return raw, epochs
+
+
+def test_iter_epochs(tmp_path):
+    """Test iterating over batches of epochs."""
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((5, 3, 50))
+    fname = str(tmp_path / "data.dat")
+    data_memmap = np.memmap(fname, dtype=np.float64, mode="w+",
+                            shape=data.shape)
+    data_memmap[:] = data
+
+    batches = list(iter_epochs(data_memmap, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    np.testing.assert_array_equal(np.concatenate(batches), data)
+
+    _, epochs = _lazy_epochs(data, tmp_path)
+    batches = list(iter_epochs(epochs.drop_bad(), batch_size=3))
+    np.testing.assert_allclose(np.concatenate(batches), data)
+
+    # testing argument checker
+    with pytest.raises(ValueError) as exc_info:
+        batches = list(iter_epochs(data, batch_size=0))
+    assert exc_info.type == ValueError
+
+
+def test_lazy_data(tmp_path):
+    """Test computing metrics on memory-mapped and lazily loaded data."""
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((4, 3, 100)).cumsum(axis=-1)
+    results = compute_metrics(data, random_state=0)
+
+    fname = str(tmp_path / "data.dat")
+    data_memmap = np.memmap(fname, dtype=np.float64, mode="w+",
+                            shape=data.shape)
+    data_memmap[:] = data
+    memmap_results = compute_metrics(data_memmap, random_state=0)
+    parallel_results = compute_metrics(
+        data_memmap, random_state=0, n_jobs=2, batch_size=1)
+
+    raw, epochs = _lazy_epochs(data, tmp_path)
+    epochs_results = compute_metrics(epochs, random_state=0)
+    for metric in results:
+        np.testing.assert_array_equal(results[metric], memmap_results[metric])
+        np.testing.assert_array_equal(
+            results[metric], parallel_results[metric])
+        np.testing.assert_allclose(results[metric], epochs_results[metric])
+
+    # the bad epochs are dropped from a copy of the input epochs
+    data[2] *= 1e3
+    (tmp_path / "reject").mkdir()
+    _, epochs = _lazy_epochs(
+        data, tmp_path / "reject", reject=dict(eeg=1e3))
+    epochs_results = compute_metrics(epochs, random_state=0)
+    assert all(len(log) == 0 for log in epochs.drop_log)
+    good_results = compute_metrics(data[[0, 1, 3]], random_state=0)
+    for metric in results:
+        np.testing.assert_allclose(
+            epochs_results[metric], good_results[metric])
+
+    # raw objects are one recording
+    lzc = lempel_ziv_complexity(raw, random_state=0)
+    assert lzc == lempel_ziv_complexity(raw.get_data(), random_state=0)
@@ -0,0 +1,43 @@
+"""Tests for parallel usuful functions."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import numpy as np
+import pytest
+
+from mecons.utils.parallel import _get_epoch_seeds, _parallel_over_epochs
+
+
+def _sum_epochs(data, epoch_seeds, offset=0):
+    """Sum each epoch plus a random number drawn from its seed."""
+    random_values = [np.random.default_rng(seed).random()
+                     for seed in epoch_seeds]
+    return data.sum(axis=(1, 2)) + offset, np.array(random_values)
+
+
+def test_parallel_over_epochs():
+    """Test running a function over epochs in parallel."""
+    # testing correct operation
+    data = np.arange(5 * 2 * 3).reshape(5, 2, 3)
+    _, epoch_seeds = _get_epoch_seeds(0, len(data))
+    sums, random_values = _parallel_over_epochs(
+        _sum_epochs, data, epoch_seeds, n_jobs=1, offset=1)
+    parallel_sums, parallel_random_values = _parallel_over_epochs(
+        _sum_epochs, data, epoch_seeds, n_jobs=2, offset=1)
+
+    np.testing.assert_array_equal(sums, data.sum(axis=(1, 2)) + 1)
+    # results are kept in order and don't depend on n_jobs
+    np.testing.assert_array_equal(sums, parallel_sums)
+    np.testing.assert_array_equal(random_values, parallel_random_values)
+
+    # reproducible seeds
+    _, other_epoch_seeds = _get_epoch_seeds(0, len(data))
+    _, other_random_values = _sum_epochs(data, other_epoch_seeds)
+    np.testing.assert_array_equal(random_values, other_random_values)
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        _get_epoch_seeds(0.5, len(data))
+    assert exc_info.type == TypeError
@@ -5,9 +5,14 @@
 # License : BSD-3-Clause
 
 import numpy as np
+from numpy.random import default_rng
+from scipy import signal
 import pytest
 
-from mecons.utils.preprocessing import detrending_normalization
+from mecons.utils.preprocessing import (
+    detrending_normalization,
+    _analytic_signal
+)
 
 
 def test_detrending_normalization():
@@ -30,8 +35,61 @@ def test_detrending_normalization():
             data_processed[ch_idx, :], data_true_processed[ch_idx, :]
         )
 
+    # same as least-squares detrending of scipy
+    rgn = default_rng(0)
+    data = rgn.standard_normal((2, 3, 500)).cumsum(axis=-1)
+    data_true_processed = signal.detrend(data, axis=-1)
+    np.testing.assert_allclose(
+        detrending_normalization(data), data_true_processed, atol=1e-10)
+
+    # preallocated output and in place
+    out = np.empty_like(data)
+    data_processed = detrending_normalization(data, out=out)
+    assert data_processed is out
+    np.testing.assert_allclose(out, data_true_processed, atol=1e-10)
+
+    data_processed = detrending_normalization(data, overwrite_input=True)
+    assert data_processed is data
+    np.testing.assert_allclose(data, data_true_processed, atol=1e-10)
+
+    # single precision
+    data_processed = detrending_normalization(
+        data.astype(np.float32), dtype=None)
+    assert data_processed.dtype == np.float32
+    assert detrending_normalization(data, dtype=np.float32).dtype == np.float32
+    assert detrending_normalization(data[:, :10].astype(int)).dtype == float
+
     # testing argument checker
     data = [[]]
     with pytest.raises(TypeError) as exc_info:
         data_processed = detrending_normalization(data)
     assert exc_info.type == TypeError
+
+    data = np.ones((2, 10))
+    with pytest.raises(ValueError) as exc_info:
+        data_processed = detrending_normalization(data, dtype=np.int8)
+    assert exc_info.type == ValueError
+
+    with pytest.raises(ValueError) as exc_info:
+        data_processed = detrending_normalization(
+            data, out=np.empty((2, 10), dtype=np.float32))
+    assert exc_info.type == ValueError
+
+
+def test_analytic_signal():
+    """Test the analytic signal computed with real-input FFTs."""
+    # testing correct operation
+    rgn = default_rng(0)
+    for n_points in [100, 101]:
+        data = rgn.standard_normal((2, 3, n_points))
+        np.testing.assert_allclose(
+            _analytic_signal(data, workers=2),
+            signal.hilbert(data, axis=-1), atol=1e-12)
+
+    # padding to a fast length keeps the number of samples
+    data = rgn.standard_normal((3, 2501))
+    analytic_signal = _analytic_signal(data, pad=True)
+    assert analytic_signal.shape == data.shape
+    np.testing.assert_allclose(analytic_signal.real, data, atol=1e-12)
+
+    assert _analytic_signal(data.astype(np.float32)).dtype == np.complex64
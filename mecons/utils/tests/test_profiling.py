@@ -0,0 +1,71 @@
+"""Tests for profiling the stages of the metrics."""
+
+# Author: Christian Ferreyra, chrisferreyra13@gmail.com
+# Date: 10.2026
+# License : BSD-3-Clause
+
+import json
+
+import numpy as np
+from numpy.random import default_rng
+import pytest
+
+from mecons.utils import profiling
+from mecons.utils.profiling import Profiler
+from mecons.complexity import compute_metrics
+
+
+def test_profiler(tmp_path):
+    """Test recording the stages of the metrics."""
+    # testing correct operation
+    rgn = default_rng(0)
+    data = rgn.standard_normal((3, 4, 200)).cumsum(axis=-1)
+
+    stages = list()
+    with Profiler(trace_memory=True,
+                  callback=lambda stage, record: stages.append(stage)) as prof:
+        results = compute_metrics(data, random_state=0)
+    assert profiling._active_profiler is None
+
+    summary = prof.to_dict()
+    for stage in ["detrending", "hilbert", "binarization", "synchrony",
+                  "column_coding", "entropy", "lzw", "surrogates"]:
+        assert stage in summary
+        assert summary[stage]["n_calls"] >= 1
+        assert summary[stage]["peak_bytes"] is not None
+    # one LZW record per epoch
+    assert summary["lzw"]["n_calls"] == 3
+    assert summary["hilbert"]["shapes"] == [[3, 4, 200]]
+    assert summary["detrending"]["total_bytes"] == data.nbytes
+    assert sorted(set(stages)) == sorted(summary)
+
+    fname = str(tmp_path / "profile.json")
+    prof.to_json(fname)
+    with open(fname) as fid:
+        assert json.load(fid) == json.loads(json.dumps(summary))
+
+    # same results when profiling is disabled, and nothing is recorded
+    prof.reset()
+    results_no_profiling = compute_metrics(data, random_state=0)
+    assert prof.records == dict()
+    for metric in results:
+        np.testing.assert_array_equal(
+            results[metric], results_no_profiling[metric])
+
+    # the peak of an outer stage includes the memory freed before an inner
+    # stage starts
+    with Profiler(trace_memory=True) as prof:
+        outer_start = profiling._start_stage()
+        temporary = np.ones(10 ** 6)
+        del temporary
+        inner_start = profiling._start_stage()
+        profiling._end_stage("inner", inner_start)
+        profiling._end_stage("outer", outer_start)
+    summary = prof.to_dict()
+    assert summary["outer"]["peak_bytes"] >= 8 * 10 ** 6
+    assert summary["inner"]["peak_bytes"] < 10 ** 6
+
+    # testing argument checker
+    with pytest.raises(TypeError) as exc_info:
+        prof = Profiler(callback=1)
+    assert exc_info.type == TypeError